@@ -56,9 +56,33 @@ def create_app():
             app.cosmos_conversation_client = None
             raise e
     
+    @app.before_serving
+    async def warmup_permit_tools():
+        # Permit tools are optional; warm them in the background only when
+        # their metadata container is configured
+        if os.environ.get("COSMOS_DB_CONTAINER"):
+            app.add_background_task(warm_permit_caches)
+    
+    @app.after_serving
+    async def close_permit_tools():
+        if os.environ.get("COSMOS_DB_CONTAINER"):
+            try:
+                from backend.permit.tools import close_clients
+                await close_clients()
+            except Exception:
+                logging.exception("Failed to close permit tool clients")
+    
     return app
 
 
+async def warm_permit_caches():
+    try:
+        from backend.permit.tools import warmup
+        await warmup()
+    except Exception:
+        logging.exception("Failed to warm permit tool caches")
+
+
 @bp.route("/")
 async def index():
     return await render_template(
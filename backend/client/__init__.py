@@ -3,15 +3,24 @@ Client classes for external services
 Provides reusable clients for Azure AI Search and CosmosDB
 """
 from .azure_search import AzureAISearch
+from .odata import ODataFilter
+from .search_cache import SemanticCache, normalize_query
 from .cosmos_db import (
     CosmosDBClient, 
+    AsyncCosmosDBClient,
     get_permit_container,
+    get_permit_container_async,
     get_conversation_container
 )
 
 __all__ = [
     'AzureAISearch',
+    'ODataFilter',
+    'SemanticCache',
+    'normalize_query',
     'CosmosDBClient',
+    'AsyncCosmosDBClient',
     'get_permit_container',
+    'get_permit_container_async',
     'get_conversation_container'
 ]
\ No newline at end of file
@@ -2,23 +2,153 @@
 Azure AI Search client for document retrieval
 """
 import os
+import asyncio
+import random
+import time
+import aiohttp
 import httpx
-from typing import List, Dict, Any, Optional
+import orjson
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Literal, Mapping, Optional, Tuple, Union
 import logging
 
+from .odata import ODataFilter
+from .search_cache import SemanticCache
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent requests issued by the batch helpers
+MAX_CONCURRENT_SEARCHES = 48
+
+# Throttling responses retried with backoff before giving up
+RETRYABLE_STATUS_CODES = (429, 503)
+MAX_SEARCH_RETRIES = 3
+
+# Errors raised by either HTTP transport
+TRANSPORT_ERRORS = (httpx.HTTPError, aiohttp.ClientError)
+
+SEARCH_API_VERSION = "2023-11-01"
+
+# Seconds before retrying an index schema read that failed
+DEFAULT_SELECT_RETRY_AFTER = 60.0
+
+# Narrow (int8 / packed binary) vector fields need a newer API version
+QUANTIZED_SEARCH_API_VERSION = "2024-07-01"
+
+@dataclass(slots=True)
+class SearchRequest:
+    """
+    Body of a docs/search request
+    Attribute names match the REST API; unset (None) attributes are omitted
+    """
+    search: Optional[str] = None
+    queryType: Optional[str] = None
+    semanticConfiguration: Optional[str] = None
+    top: Optional[int] = None
+    select: Optional[str] = None
+    filter: Optional[str] = None
+    vectorQueries: Optional[List[Dict[str, Any]]] = None
+    captions: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the request body without unset attributes"""
+        body = {}
+        for name in _SEARCH_REQUEST_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                body[name] = value
+        return body
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the request body to JSON"""
+        return orjson.dumps(self.to_dict())
+
+
+_SEARCH_REQUEST_FIELDS = tuple(f.name for f in fields(SearchRequest))
+
+
+@lru_cache(maxsize=32)
+def _join_fields(fields: Tuple[str, ...]) -> str:
+    """Join field names into the comma-separated form the REST API expects"""
+    return ",".join(fields)
+
+
+def _render_filter(filter_query: Optional[Union[str, ODataFilter]]) -> Optional[str]:
+    """Normalize a filter argument to the OData string sent to the service"""
+    if isinstance(filter_query, ODataFilter):
+        return filter_query.render()
+    return filter_query or None
+
+
+def quantize_int8(vector: List[float]) -> List[int]:
+    """
+    Scale a float vector into signed 8-bit integers
+    
+    Uses a symmetric per-vector scale so the largest magnitude maps to 127.
+    Only useful against Collection(Edm.SByte) vector fields.
+    """
+    peak = max((abs(x) for x in vector), default=0.0)
+    if peak == 0:
+        return [0] * len(vector)
+    scale = 127 / peak
+    return [int(round(x * scale)) for x in vector]
+
+
+def quantize_binary(vector: List[float]) -> List[int]:
+    """
+    Pack the sign bits of a float vector into bytes (most significant bit first)
+    
+    Matches numpy.packbits(vector > 0) and the packedBit vector encoding.
+    Only useful against Collection(Edm.Byte) fields with packedBit encoding.
+    """
+    packed = []
+    for start in range(0, len(vector), 8):
+        chunk = vector[start:start + 8]
+        byte = 0
+        for x in chunk:
+            byte = (byte << 1) | (x > 0)
+        packed.append(byte << (8 - len(chunk)))
+    return packed
+
+
 class AzureAISearch:
     """
     Client for Azure AI Search operations
     Provides semantic search and vector search capabilities
     """
     
+    # Never returned unless explicitly selected; embeddings are large and
+    # callers work with the text fields
+    DEFAULT_EXCLUDED_FIELDS = ("contentVector", "titleVector")
+    
+    # Fixed attribute layout: no per-instance __dict__ and faster attribute
+    # access on the request path
+    __slots__ = (
+        "base_url",
+        "api_key",
+        "index_name",
+        "transport",
+        "headers",
+        "cache",
+        "_search_url",
+        "_api_params",
+        "_default_select",
+        "_default_select_loaded",
+        "_default_select_retry_at",
+        "_default_select_lock",
+        "_client",
+        "_session",
+    )
+    
     def __init__(
         self, 
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
-        index_name: Optional[str] = None
+        index_name: Optional[str] = None,
+        cache: Optional[SemanticCache] = None,
+        transport: Literal["httpx", "aiohttp"] = "httpx"
     ):
         """
         Initialize Azure AI Search client
@@ -27,8 +157,14 @@ class AzureAISearch:
             base_url: Azure AI Search endpoint (defaults to env var)
             api_key: API key (defaults to env var)
             index_name: Index name (defaults to env var)
+            cache: Response cache for keyword searches, e.g. a SemanticCache
+                (no caching if None, so results always reflect the index)
+            transport: HTTP stack used for requests:
+                - 'httpx': pooled HTTP/2 AsyncClient
+                - 'aiohttp': pooled ClientSession with a C-level HTTP parser,
+                  lower per-request overhead for high-QPS batch workloads
         """
-        self.base_url = base_url or os.getenv("AZURE_AI_SEARCH_ENDPOINT")
+        self.base_url = (base_url or os.getenv("AZURE_AI_SEARCH_ENDPOINT") or "").rstrip("/")
         self.api_key = api_key or os.getenv("AZURE_AI_SEARCH_API_KEY")
         self.index_name = index_name or os.getenv("AZURE_AI_SEARCH_INDEX_NAME")
         
@@ -38,20 +174,264 @@ class AzureAISearch:
                 "Set AZURE_AI_SEARCH_ENDPOINT, AZURE_AI_SEARCH_API_KEY, and AZURE_AI_SEARCH_INDEX_NAME"
             )
         
-        self.headers = {
+        if transport not in ("httpx", "aiohttp"):
+            raise ValueError(f"Unsupported transport: {transport}")
+        self.transport = transport
+        
+        self.headers = MappingProxyType({
             "Content-Type": "application/json",
             "api-key": self.api_key
-        }
+        })
+        
+        self._search_url = f"/indexes/{self.index_name}/docs/search"
+        self._api_params = MappingProxyType({"api-version": SEARCH_API_VERSION})
+        
+        self.cache = cache
+        
+        self._default_select: Optional[str] = None
+        self._default_select_loaded = False
+        self._default_select_retry_at = 0.0
+        self._default_select_lock = asyncio.Lock()
+        
+        # HTTP clients are opened on first request (aiohttp sessions must be
+        # created inside a running event loop) and again after close()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._session: Optional[aiohttp.ClientSession] = None
         
         logger.info(f"Initialized AzureAISearch client for index: {self.index_name}")
     
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP connection pool
+        The client stays usable; the next request opens a new pool
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self) -> "AzureAISearch":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def warmup(self) -> None:
+        """
+        Open the pooled connection before the first search
+        
+        Sends a document count request, which query keys are allowed to make,
+        over the connection the searches use. The index schema behind the
+        default select fields is still read on first use, since callers that
+        pass select_fields never need it. Safe to call at startup; failures
+        are logged and the first search simply pays the setup cost instead.
+        """
+        try:
+            await self._request("GET", f"/indexes/{self.index_name}/docs/$count", self._api_params)
+        except TRANSPORT_ERRORS as e:
+            logger.warning(f"Azure AI Search warm-up failed: {e}")
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared httpx client, opening it on first use
+        
+        HTTP/2 with keep-alive reuses pooled HTTPS connections, so concurrent
+        searches multiplex over a handful of sockets instead of paying a new
+        TCP+TLS handshake on every search.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=8,
+                    max_connections=8,
+                    keepalive_expiry=90.0
+                )
+            )
+        return self._client
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, opening it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=dict(self.headers),
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=90,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, str],
+        content: Optional[bytes] = None,
+        raise_retryable: bool = True
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        """
+        Send a request over the configured transport
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the service endpoint
+            params: Query string parameters
+            content: Serialized JSON body
+            raise_retryable: Raise on throttling statuses too, instead of
+                returning them so the caller can retry
+            
+        Returns:
+            Status code, response headers and raw body
+        """
+        if self.transport == "aiohttp":
+            async with self._get_session().request(
+                method,
+                f"{self.base_url}{path}",
+                params=dict(params),
+                data=content
+            ) as response:
+                if raise_retryable or response.status not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                return response.status, response.headers, await response.read()
+        
+        response = await self._get_client().request(method, path, params=params, content=content)
+        if raise_retryable or response.status_code not in RETRYABLE_STATUS_CODES:
+            response.raise_for_status()
+        return response.status_code, response.headers, response.content
+    
+    async def _get_default_select(self) -> Optional[str]:
+        """
+        Build the select clause used when callers don't pass select_fields
+        
+        Reads the index schema once and keeps every retrievable field except
+        vector fields. Falls back to returning all fields if the schema can't
+        be read (e.g. when using a query key), and tries again after
+        DEFAULT_SELECT_RETRY_AFTER seconds. Concurrent first calls share one
+        schema read.
+        
+        Returns:
+            Comma-separated field list, or None to let the service return all fields
+        """
+        if self._default_select_loaded or time.monotonic() < self._default_select_retry_at:
+            return self._default_select
+        
+        async with self._default_select_lock:
+            if self._default_select_loaded or time.monotonic() < self._default_select_retry_at:
+                return self._default_select
+            
+            try:
+                _, _, body = await self._request(
+                    "GET",
+                    f"/indexes/{self.index_name}",
+                    self._api_params
+                )
+            except TRANSPORT_ERRORS as e:
+                logger.warning(f"Could not read index schema, returning all fields: {e}")
+                self._default_select_retry_at = time.monotonic() + DEFAULT_SELECT_RETRY_AFTER
+                return None
+            
+            fields = orjson.loads(body).get("fields", [])
+            self._default_select = _join_fields(tuple(
+                field["name"] for field in fields
+                if field.get("retrievable", True)
+                and not field.get("dimensions")
+                and field["name"] not in self.DEFAULT_EXCLUDED_FIELDS
+            )) or None
+            self._default_select_loaded = True
+        
+        return self._default_select
+    
+    async def _resolve_select(self, select_fields: Optional[List[str]]) -> Optional[str]:
+        """Return the select clause for a request"""
+        if select_fields:
+            return _join_fields(tuple(select_fields))
+        return await self._get_default_select()
+    
+    @staticmethod
+    def _retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+        """
+        Seconds to wait before retrying a throttled request
+        Honors retry-after-ms / Retry-After and falls back to exponential backoff
+        """
+        try:
+            if "retry-after-ms" in headers:
+                delay = float(headers["retry-after-ms"]) / 1000
+            else:
+                delay = float(headers.get("Retry-After", 2 ** attempt))
+        except ValueError:
+            delay = float(2 ** attempt)
+        return delay + random.uniform(0, 0.2)
+    
+    async def _post_search(
+        self,
+        request: SearchRequest,
+        error_label: str,
+        api_params: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a search request over the configured transport
+        
+        Throttled (429/503) responses are retried with jittered backoff.
+        
+        Args:
+            request: Search request body
+            error_label: Prefix used when logging HTTP errors
+            api_params: Query string override (defaults to the client api-version)
+            
+        Returns:
+            Parsed search response
+        """
+        content = request.to_bytes()
+        
+        try:
+            for attempt in range(MAX_SEARCH_RETRIES + 1):
+                status, headers, body = await self._request(
+                    "POST",
+                    self._search_url,
+                    api_params or self._api_params,
+                    content,
+                    raise_retryable=attempt == MAX_SEARCH_RETRIES
+                )
+                if status not in RETRYABLE_STATUS_CODES:
+                    break
+                
+                delay = self._retry_delay(headers, attempt)
+                logger.warning(
+                    f"Azure AI Search returned {status}, "
+                    f"retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_SEARCH_RETRIES})"
+                )
+                await asyncio.sleep(delay)
+            
+            result = orjson.loads(body)
+        except TRANSPORT_ERRORS as e:
+            logger.error(f"{error_label}: {e}")
+            raise
+        
+        hits = result.get("value")
+        if hits and request.select is None:
+            returned = [f for f in self.DEFAULT_EXCLUDED_FIELDS if f in hits[0]]
+            if returned:
+                logger.warning(f"Search response includes vector fields: {', '.join(returned)}")
+        
+        return result
+    
     async def semantic_ranking_search(
         self, 
         keyword: str, 
         k: int = 10,
         select_fields: Optional[List[str]] = None,
         vector_fields: Optional[List[str]] = None,
-        filter_query: Optional[str] = None
+        filter_query: Optional[Union[str, ODataFilter]] = None,
+        captions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform semantic ranking search on Azure AI Search
@@ -59,9 +439,14 @@ class AzureAISearch:
         Args:
             keyword: Search query
             k: Number of results to return (top-k)
-            select_fields: Fields to include in response
+            select_fields: Fields to include in response (defaults to all
+                non-vector fields)
             vector_fields: Vector fields for hybrid search
-            filter_query: OData filter expression
+            filter_query: OData filter expression or ODataFilter
+            captions: Semantic caption mode, e.g. "extractive" or
+                "extractive|highlight-false"; captions are returned per
+                document in "@search.captions", so long content fields
+                need not be selected
             
         Returns:
             Search results with value list containing matching documents
@@ -72,41 +457,42 @@ class AzureAISearch:
             ...     keyword="submarine pipeline",
             ...     k=5,
             ...     select_fields=["title", "content"],
-            ...     filter_query="permitType eq 'PLO'"
+            ...     filter_query=ODataFilter.eq("permitType", "PLO")
             ... )
         """
-        url = f"{self.base_url}/indexes/{self.index_name}/docs/search?api-version=2023-11-01"
+        filter_query = _render_filter(filter_query)
+        cache_key = (
+            "semantic", self.index_name, filter_query, k,
+            tuple(select_fields or ()), tuple(vector_fields or ()), captions
+        )
+        if self.cache is not None:
+            cached = await self.cache.aget(cache_key, keyword)
+            if cached is not None:
+                return cached
         
-        payload = {
-            "search": keyword,
-            "queryType": "semantic",
-            "semanticConfiguration": "default",
-            "top": k,
-        }
-        
-        if select_fields:
-            payload["select"] = ",".join(select_fields)
+        request = SearchRequest(
+            search=keyword,
+            queryType="semantic",
+            semanticConfiguration="default",
+            top=k,
+            select=await self._resolve_select(select_fields),
+            filter=filter_query,
+            captions=captions
+        )
         
         if vector_fields:
-            payload["vectorQueries"] = [
+            request.vectorQueries = [
                 {
                     "kind": "text",
                     "text": keyword,
-                    "fields": ",".join(vector_fields)
+                    "fields": _join_fields(tuple(vector_fields))
                 }
             ]
         
-        if filter_query:
-            payload["filter"] = filter_query
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"Azure AI Search error: {e}")
-            raise
+        result = await self._post_search(request, "Azure AI Search error")
+        if self.cache is not None:
+            await self.cache.aset(cache_key, keyword, result)
+        return result
     
     async def vector_search(
         self,
@@ -114,7 +500,8 @@ class AzureAISearch:
         k: int = 10,
         vector_fields: List[str] = None,
         select_fields: List[str] = None,
-        filter_query: Optional[str] = None
+        filter_query: Optional[Union[str, ODataFilter]] = None,
+        quantization: Literal["none", "int8", "binary"] = "none"
     ) -> Dict[str, Any]:
         """
         Perform pure vector search
@@ -123,39 +510,39 @@ class AzureAISearch:
             vector: Embedding vector
             k: Number of results
             vector_fields: Fields containing vectors
-            select_fields: Fields to return
-            filter_query: OData filter
+            select_fields: Fields to return (defaults to all non-vector fields)
+            filter_query: OData filter expression or ODataFilter
+            quantization: Shrink the query vector before sending it:
+                - 'none': send float32 values as-is
+                - 'int8': scaled signed bytes, for Collection(Edm.SByte) fields
+                - 'binary': packed sign bits, for packedBit Collection(Edm.Byte) fields
             
         Returns:
             Search results
         """
-        url = f"{self.base_url}/indexes/{self.index_name}/docs/search?api-version=2023-11-01"
+        filter_query = _render_filter(filter_query)
+        api_params = None
+        if quantization == "int8":
+            vector = quantize_int8(vector)
+            api_params = {"api-version": QUANTIZED_SEARCH_API_VERSION}
+        elif quantization == "binary":
+            vector = quantize_binary(vector)
+            api_params = {"api-version": QUANTIZED_SEARCH_API_VERSION}
         
-        payload = {
-            "vectorQueries": [
+        request = SearchRequest(
+            vectorQueries=[
                 {
                     "kind": "vector",
                     "vector": vector,
-                    "fields": ",".join(vector_fields or ["contentVector"]),
+                    "fields": _join_fields(tuple(vector_fields or ("contentVector",))),
                     "k": k
                 }
-            ]
-        }
+            ],
+            select=await self._resolve_select(select_fields),
+            filter=filter_query
+        )
         
-        if select_fields:
-            payload["select"] = ",".join(select_fields)
-        
-        if filter_query:
-            payload["filter"] = filter_query
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"Vector search error: {e}")
-            raise
+        return await self._post_search(request, "Vector search error", api_params)
     
     async def hybrid_search(
         self,
@@ -163,7 +550,7 @@ class AzureAISearch:
         vector: Optional[List[float]] = None,
         k: int = 10,
         select_fields: Optional[List[str]] = None,
-        filter_query: Optional[str] = None
+        filter_query: Optional[Union[str, ODataFilter]] = None
     ) -> Dict[str, Any]:
         """
         Perform hybrid search (semantic + vector)
@@ -172,23 +559,33 @@ class AzureAISearch:
             keyword: Text query
             vector: Optional embedding vector
             k: Number of results
-            select_fields: Fields to return
-            filter_query: OData filter
+            select_fields: Fields to return (defaults to all non-vector fields)
+            filter_query: OData filter expression or ODataFilter
             
         Returns:
             Search results combining semantic and vector search
         """
-        url = f"{self.base_url}/indexes/{self.index_name}/docs/search?api-version=2023-11-01"
+        filter_query = _render_filter(filter_query)
+        cache_key = (
+            "hybrid", self.index_name, filter_query, k,
+            tuple(select_fields or ()), tuple(vector or ())
+        )
+        if self.cache is not None:
+            cached = await self.cache.aget(cache_key, keyword)
+            if cached is not None:
+                return cached
         
-        payload = {
-            "search": keyword,
-            "queryType": "semantic",
-            "semanticConfiguration": "default",
-            "top": k,
-        }
+        request = SearchRequest(
+            search=keyword,
+            queryType="semantic",
+            semanticConfiguration="default",
+            top=k,
+            select=await self._resolve_select(select_fields),
+            filter=filter_query
+        )
         
         if vector:
-            payload["vectorQueries"] = [
+            request.vectorQueries = [
                 {
                     "kind": "vector",
                     "vector": vector,
@@ -197,17 +594,92 @@ class AzureAISearch:
                 }
             ]
         
-        if select_fields:
-            payload["select"] = ",".join(select_fields)
+        result = await self._post_search(request, "Hybrid search error")
+        if self.cache is not None:
+            await self.cache.aset(cache_key, keyword, result)
+        return result
+    
+    async def semantic_ranking_search_batch(
+        self,
+        keywords: List[str],
+        k: int = 10,
+        select_fields: Optional[List[str]] = None,
+        vector_fields: Optional[List[str]] = None,
+        filter_query: Optional[Union[str, ODataFilter]] = None,
+        captions: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several semantic ranking searches concurrently
+        
+        Args:
+            keywords: Search queries
+            k: Number of results per query
+            select_fields: Fields to include in response
+            vector_fields: Vector fields for hybrid search
+            filter_query: OData filter expression or ODataFilter
+            captions: Semantic caption mode (see semantic_ranking_search)
+            
+        Returns:
+            Search results in the same order as keywords
+            
+        Example:
+            >>> results = await client.semantic_ranking_search_batch(
+            ...     ["submarine pipeline", "IT Semarang"],
+            ...     k=5
+            ... )
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
         
-        if filter_query:
-            payload["filter"] = filter_query
+        async def search(keyword: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.semantic_ranking_search(
+                    keyword=keyword,
+                    k=k,
+                    select_fields=select_fields,
+                    vector_fields=vector_fields,
+                    filter_query=filter_query,
+                    captions=captions
+                )
         
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"Hybrid search error: {e}")
-            raise
\ No newline at end of file
+        return await asyncio.gather(*[search(keyword) for keyword in keywords])
+    
+    async def vector_search_batch(
+        self,
+        vectors: List[List[float]],
+        k: int = 10,
+        vector_fields: List[str] = None,
+        select_fields: List[str] = None,
+        filter_query: Optional[Union[str, ODataFilter]] = None,
+        quantization: Literal["none", "int8", "binary"] = "none"
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several vector searches concurrently
+        
+        Multiple vectorQueries in one request are fused into a single ranked
+        list by Azure AI Search, so each vector is sent as its own request.
+        
+        Args:
+            vectors: Embedding vectors
+            k: Number of results per query
+            vector_fields: Fields containing vectors
+            select_fields: Fields to return (defaults to all non-vector fields)
+            filter_query: OData filter expression or ODataFilter
+            quantization: Query vector compression (see vector_search)
+            
+        Returns:
+            Search results in the same order as vectors
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+        
+        async def search(vector: List[float]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.vector_search(
+                    vector=vector,
+                    k=k,
+                    vector_fields=vector_fields,
+                    select_fields=select_fields,
+                    filter_query=filter_query,
+                    quantization=quantization
+                )
+        
+        return await asyncio.gather(*[search(vector) for vector in vectors])
@@ -1,15 +1,57 @@
 """
 CosmosDB client for permit metadata storage and queries
 """
+import json
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import types
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple, Type, TypeVar, Union
 from azure.cosmos import CosmosClient as AzureCosmosClient, PartitionKey
+from azure.cosmos.aio import CosmosClient as AzureCosmosClientAsync
+from azure.cosmos.aio import ContainerProxy as AsyncContainerProxy
+from azure.cosmos.aio import DatabaseProxy as AsyncDatabaseProxy
 from azure.cosmos.container import ContainerProxy
 from azure.cosmos.database import DatabaseProxy
+from azure.cosmos import _synchronized_request
+from azure.cosmos.aio import _asynchronous_request
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+RowT = TypeVar("RowT")
+
+# Shared clients keyed by (client class, uri, database, container) so every
+# caller reuses one connection pool instead of building a new client per call
+_CLIENT_CACHE: Dict[Tuple[type, str, str, str], Any] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _fast_json_loads(data: str) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # e.g. integers wider than 64 bits, which stdlib json still accepts
+        return json.loads(data)
+
+
+def _install_orjson_decoder() -> None:
+    """
+    Make the Cosmos SDK parse response bodies with orjson
+    
+    azure-cosmos has no deserializer option; its sync and async request
+    modules call json.loads on every response body, so their module-level
+    json reference is swapped for a shim whose loads uses orjson. Request
+    serialization keeps using stdlib json.dumps.
+    """
+    shim = types.SimpleNamespace(loads=_fast_json_loads, dumps=json.dumps)
+    for module in (_synchronized_request, _asynchronous_request):
+        if getattr(module, "json", None) is json:
+            module.json = shim
+
+
+_install_orjson_decoder()
+
 class CosmosDBClient:
     """
     Client for CosmosDB operations
@@ -44,27 +86,48 @@ class CosmosDBClient:
             )
         
         self.client = AzureCosmosClient(url=self.uri, credential=self.key)
-        self._database = None
-        self._container = None
+        
+        # Proxies are lightweight and share the client's connection pool,
+        # so build them once up front instead of on first access
+        self.database: Optional[DatabaseProxy] = (
+            self.client.get_database_client(self.database_id)
+            if self.database_id else None
+        )
+        self.container: Optional[ContainerProxy] = (
+            self.database.get_container_client(self.container_id)
+            if self.database is not None and self.container_id else None
+        )
         
         logger.info(
             f"Initialized CosmosDBClient for database: {self.database_id}, "
             f"container: {self.container_id}"
         )
     
-    @property
-    def database(self) -> DatabaseProxy:
-        """Get or create database proxy"""
-        if self._database is None:
-            self._database = self.client.get_database_client(self.database_id)
-        return self._database
-    
-    @property
-    def container(self) -> ContainerProxy:
-        """Get or create container proxy"""
-        if self._container is None:
-            self._container = self.database.get_container_client(self.container_id)
-        return self._container
+    def iter_items(
+        self,
+        query: str,
+        parameters: Optional[List[Dict[str, Any]]] = None,
+        enable_cross_partition_query: bool = True,
+        max_item_count: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute query on container and stream results page by page
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+            enable_cross_partition_query: Enable cross-partition queries
+            max_item_count: Page size hint for Cosmos continuation paging
+            
+        Returns:
+            Lazy iterator over query results; pages are fetched as it advances
+        """
+        return self.container.query_items(
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=enable_cross_partition_query,
+            max_item_count=max_item_count
+        )
     
     def query_items(
         self,
@@ -84,7 +147,7 @@ class CosmosDBClient:
             List of query results
         """
         try:
-            items = list(self.container.query_items(
+            items = list(self.iter_items(
                 query=query,
                 parameters=parameters,
                 enable_cross_partition_query=enable_cross_partition_query
@@ -94,6 +157,204 @@ class CosmosDBClient:
         except Exception as e:
             logger.error(f"Error querying items: {str(e)}")
             raise
+    
+    def query_items_typed(
+        self,
+        query: str,
+        row_cls: Type[RowT],
+        parameters: Optional[List[Dict[str, Any]]] = None,
+        enable_cross_partition_query: bool = True
+    ) -> List[RowT]:
+        """
+        Execute query on container and build one row object per result
+        
+        Args:
+            query: SQL query string
+            row_cls: Row type whose fields match the SELECT projection, e.g. a
+                @dataclass(slots=True, frozen=True); fields that may be
+                undefined in Cosmos need defaults
+            parameters: Query parameters
+            enable_cross_partition_query: Enable cross-partition queries
+            
+        Returns:
+            List of row_cls instances
+            
+        Example:
+            >>> @dataclass(slots=True, frozen=True)
+            ... class PermitRow:
+            ...     permitNumber: str
+            ...     permitType: Optional[str] = None
+            >>> rows = client.query_items_typed(
+            ...     "SELECT p.permitNumber, c.permitType FROM c JOIN p IN c.permits",
+            ...     PermitRow
+            ... )
+            >>> rows[0].permitType
+        """
+        try:
+            rows = [
+                row_cls(**item)
+                for item in self.iter_items(
+                    query=query,
+                    parameters=parameters,
+                    enable_cross_partition_query=enable_cross_partition_query
+                )
+            ]
+            logger.debug(f"Query returned {len(rows)} {row_cls.__name__} rows")
+            return rows
+        except Exception as e:
+            logger.error(f"Error querying items: {str(e)}")
+            raise
+
+
+class AsyncCosmosDBClient:
+    """
+    Async client for CosmosDB operations
+    Uses azure.cosmos.aio so queries yield to the event loop instead of blocking it
+    """
+    
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        key: Optional[str] = None,
+        database_id: Optional[str] = None,
+        container_id: Optional[str] = None
+    ):
+        """
+        Initialize async CosmosDB client
+        
+        Args:
+            uri: CosmosDB endpoint URI
+            key: CosmosDB key
+            database_id: Database name
+            container_id: Container name
+        """
+        self.uri = uri
+        self.key = key
+        self.database_id = database_id
+        self.container_id = container_id
+        
+        if not all([self.uri, self.key]):
+            raise ValueError(
+                "CosmosDB credentials not configured. "
+                "Provide uri and key parameters"
+            )
+        
+        self.client = AzureCosmosClientAsync(url=self.uri, credential=self.key)
+        
+        # Proxies are lightweight and share the client's connection pool,
+        # so build them once up front instead of on first access
+        self.database: Optional[AsyncDatabaseProxy] = (
+            self.client.get_database_client(self.database_id)
+            if self.database_id else None
+        )
+        self.container: Optional[AsyncContainerProxy] = (
+            self.database.get_container_client(self.container_id)
+            if self.database is not None and self.container_id else None
+        )
+        
+        logger.info(
+            f"Initialized AsyncCosmosDBClient for database: {self.database_id}, "
+            f"container: {self.container_id}"
+        )
+    
+    def aiter_items(
+        self,
+        query: str,
+        parameters: Optional[List[Dict[str, Any]]] = None,
+        max_item_count: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute query on container and stream results page by page
+        
+        The async SDK always fans out across partitions unless a partition
+        key is given, so there is no enable_cross_partition_query flag.
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+            max_item_count: Page size hint for Cosmos continuation paging
+            
+        Returns:
+            Async iterator over query results
+        """
+        return self.container.query_items(
+            query=query,
+            parameters=parameters,
+            max_item_count=max_item_count
+        )
+    
+    async def query_items(
+        self,
+        query: str,
+        parameters: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute query on container
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+            
+        Returns:
+            List of query results
+        """
+        try:
+            items = [item async for item in self.aiter_items(query=query, parameters=parameters)]
+            logger.debug(f"Query returned {len(items)} items")
+            return items
+        except Exception as e:
+            logger.error(f"Error querying items: {str(e)}")
+            raise
+    
+    async def close(self) -> None:
+        """Close the underlying aiohttp session"""
+        await self.client.close()
+
+
+def _get_cached_client(
+    uri: str,
+    key: str,
+    database_id: str,
+    container_id: str,
+    client_cls: Type[Union[CosmosDBClient, AsyncCosmosDBClient]] = CosmosDBClient
+) -> Union[CosmosDBClient, AsyncCosmosDBClient]:
+    """
+    Return the shared client for a (uri, database, container) triple,
+    creating it on first use
+    """
+    cache_key = (client_cls, uri, database_id, container_id)
+    client = _CLIENT_CACHE.get(cache_key)
+    if client is not None:
+        return client
+    
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            client = client_cls(
+                uri=uri,
+                key=key,
+                database_id=database_id,
+                container_id=container_id
+            )
+            _CLIENT_CACHE[cache_key] = client
+    return client
+
+
+def _get_permit_settings() -> Tuple[str, str, str, str]:
+    """Resolve permit metadata CosmosDB settings from the environment"""
+    uri = os.getenv("COSMOS_DB_URI")
+    key = os.getenv("COSMOS_DB_KEY")
+    database = os.getenv("COSMOS_DB_DATABASE")
+    container = os.getenv("COSMOS_DB_CONTAINER")
+    
+    if not all([uri, key, database, container]):
+        raise ValueError(
+            "Permit Metadata CosmosDB not configured. "
+            "Set COSMOS_DB_URI, COSMOS_DB_KEY, COSMOS_DB_DATABASE, "
+            "and COSMOS_DB_CONTAINER in .env"
+        )
+    
+    return uri, key, database, container
 
 
 def get_permit_container() -> ContainerProxy:
@@ -105,6 +366,9 @@ def get_permit_container() -> ContainerProxy:
     - COSMOS_DB_DATABASE
     - COSMOS_DB_CONTAINER
     
+    The underlying client is created once and shared across calls;
+    the returned ContainerProxy is thread-safe.
+    
     Returns:
         Container proxy for permit metadata
         
@@ -115,24 +379,34 @@ def get_permit_container() -> ContainerProxy:
         ...     enable_cross_partition_query=True
         ... )
     """
-    uri = os.getenv("COSMOS_DB_URI")
-    key = os.getenv("COSMOS_DB_KEY")
-    database = os.getenv("COSMOS_DB_DATABASE")
-    container = os.getenv("COSMOS_DB_CONTAINER")
+    uri, key, database, container = _get_permit_settings()
     
-    if not all([uri, key, database, container]):
-        raise ValueError(
-            "Permit Metadata CosmosDB not configured. "
-            "Set COSMOS_DB_URI, COSMOS_DB_KEY, COSMOS_DB_DATABASE, "
-            "and COSMOS_DB_CONTAINER in .env"
-        )
+    client = _get_cached_client(uri, key, database, container)
+    return client.container
+
+
+def get_permit_container_async() -> AsyncContainerProxy:
+    """
+    Get permit metadata container from CosmosDB for use from async code
+    Uses the same environment variables as get_permit_container()
+    
+    The underlying azure.cosmos.aio client is created once and shared, so
+    its aiohttp session is reused across calls.
+    
+    Returns:
+        Async container proxy for permit metadata
+        
+    Example:
+        >>> container = get_permit_container_async()
+        >>> results = [
+        ...     item async for item in container.query_items(
+        ...         query="SELECT * FROM c WHERE c.permitType = 'PLO'"
+        ...     )
+        ... ]
+    """
+    uri, key, database, container = _get_permit_settings()
     
-    client = CosmosDBClient(
-        uri=uri,
-        key=key,
-        database_id=database,
-        container_id=container
-    )
+    client = _get_cached_client(uri, key, database, container, AsyncCosmosDBClient)
     return client.container
 
 
@@ -145,6 +419,9 @@ def get_conversation_container() -> ContainerProxy:
     - AZURE_COSMOSDB_DATABASE
     - AZURE_COSMOSDB_CONVERSATIONS_CONTAINER
     
+    The underlying client is created once and shared across calls;
+    the returned ContainerProxy is thread-safe.
+    
     Returns:
         Container proxy for conversation history
         
@@ -166,10 +443,5 @@ def get_conversation_container() -> ContainerProxy:
     
     uri = f"https://{account}.documents.azure.com:443/"
     
-    client = CosmosDBClient(
-        uri=uri,
-        key=key,
-        database_id=database,
-        container_id=container
-    )
+    client = _get_cached_client(uri, key, database, container)
     return client.container
\ No newline at end of file
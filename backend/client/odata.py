@@ -0,0 +1,128 @@
+"""
+OData filter builder for Azure AI Search
+Builds filter expressions from field/value pairs with safe literal escaping
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Tuple
+
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(/[A-Za-z_][A-Za-z0-9_]*)*$")
+
+_COMPARISON_OPERATORS = ("eq", "ne", "gt", "ge", "lt", "le")
+
+
+def _check_field(field: str) -> str:
+    if not isinstance(field, str) or not _FIELD_PATTERN.match(field):
+        raise ValueError(f"Invalid OData field name: {field!r}")
+    return field
+
+
+def format_literal(value: Any) -> str:
+    """
+    Render a Python value as an OData literal
+
+    Strings are single-quoted with embedded quotes doubled, so values can't
+    break out of the literal. Datetimes are rendered in UTC with a Z suffix,
+    as Edm.DateTimeOffset requires; naive datetimes are taken to be UTC.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return f"{value.isoformat()}Z"
+    if isinstance(value, date):
+        return f"{value.isoformat()}T00:00:00Z"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(f"Unsupported OData literal type: {type(value).__name__}")
+
+
+@dataclass(frozen=True)
+class ODataFilter:
+    """
+    Immutable OData filter expression
+
+    Build with the comparison classmethods and combine with ``&``, ``|``
+    and ``~``.
+
+    Example:
+        >>> flt = ODataFilter.eq("permitType", "PLO") & ODataFilter.ge("year", 2024)
+        >>> flt.render()
+        "(permitType eq 'PLO') and (year ge 2024)"
+    """
+    op: str
+    operands: Tuple[Any, ...]
+
+    @classmethod
+    def _compare(cls, op: str, field: str, value: Any) -> "ODataFilter":
+        return cls(op, (_check_field(field), value))
+
+    @classmethod
+    def eq(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("eq", field, value)
+
+    @classmethod
+    def ne(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("ne", field, value)
+
+    @classmethod
+    def gt(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("gt", field, value)
+
+    @classmethod
+    def ge(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("ge", field, value)
+
+    @classmethod
+    def lt(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("lt", field, value)
+
+    @classmethod
+    def le(cls, field: str, value: Any) -> "ODataFilter":
+        return cls._compare("le", field, value)
+
+    @classmethod
+    def in_(cls, field: str, values: Iterable[str]) -> "ODataFilter":
+        """Match any of several string values using search.in"""
+        values = tuple(values)
+        if any("|" in value for value in values):
+            raise ValueError("search.in values must not contain '|'")
+        return cls("in", (_check_field(field), values))
+
+    def __and__(self, other: "ODataFilter") -> "ODataFilter":
+        return ODataFilter("and", (self, other))
+
+    def __or__(self, other: "ODataFilter") -> "ODataFilter":
+        return ODataFilter("or", (self, other))
+
+    def __invert__(self) -> "ODataFilter":
+        return ODataFilter("not", (self,))
+
+    def render(self) -> str:
+        """Return the filter as an OData expression string"""
+        return _render(self)
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+def _render(node: ODataFilter) -> str:
+    op, operands = node.op, node.operands
+    if op in _COMPARISON_OPERATORS:
+        field, value = operands
+        return f"{field} {op} {format_literal(value)}"
+    if op == "in":
+        field, values = operands
+        return f"search.in({field}, {format_literal('|'.join(values))}, '|')"
+    if op in ("and", "or"):
+        left, right = operands
+        return f"({_render(left)}) {op} ({_render(right)})"
+    if op == "not":
+        return f"not ({_render(operands[0])})"
+    raise ValueError(f"Unknown OData operator: {op}")
@@ -0,0 +1,245 @@
+"""
+In-process response cache for Azure AI Search queries
+Serves repeated and near-duplicate queries without a network round-trip
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISS = object()
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial variants share a key"""
+    return " ".join(text.lower().split())
+
+
+def _l2_normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+def _best_match(
+    query_vector: List[float],
+    candidates: List[Tuple[Hashable, List[float]]],
+    threshold: float
+) -> Tuple[Optional[Hashable], float]:
+    """Candidate key with the highest cosine similarity at or above threshold"""
+    best_key, best_score = None, threshold
+    for key, vector in candidates:
+        score = sum(a * b for a, b in zip(query_vector, vector))
+        if score >= best_score:
+            best_key, best_score = key, score
+    return best_key, best_score
+
+
+class SemanticCache:
+    """
+    LRU cache with TTL for search responses
+
+    Entries are namespaced (e.g. by index, filter, k and selected fields) so
+    results never leak between differently-shaped queries. Lookups first try
+    the normalized query text; when an ``embed`` function is supplied, a miss
+    falls back to the most similar cached query in the same namespace whose
+    cosine similarity reaches ``threshold``.
+
+    Query embeddings are memoized, so a lookup followed by a store (or a
+    repeated prompt) embeds the text only once. After an embedding failure
+    the cache sticks to exact matches for ``embed_retry_after`` seconds
+    instead of paying a failing round-trip on every lookup.
+
+    The similarity scan only considers the ``max_scan`` most recently used
+    entries of the namespace; ``aget`` runs it in a worker thread. Async callers should use
+    ``aget``/``aset``, which run the embedding in a worker thread so the
+    event loop is not blocked.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        threshold: float = 0.9,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        embed_retry_after: float = 60.0,
+        max_scan: int = 256
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a cached response stays valid
+            threshold: Minimum cosine similarity for a semantic hit
+            embed: Optional function mapping query text to an embedding
+            embed_retry_after: Seconds to skip embedding after it fails
+            max_scan: Most entries compared on a semantic lookup
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.embed = embed
+        self.embed_retry_after = embed_retry_after
+        self.max_scan = max_scan
+        self._embed_disabled_until = 0.0
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[Optional[List[float]], Any, float]]" = OrderedDict()
+        self._vectors: "OrderedDict[str, Optional[List[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _embedding_disabled(self) -> bool:
+        return time.monotonic() < self._embed_disabled_until
+
+    def _compute_vector(self, text: str) -> Optional[List[float]]:
+        if self._embedding_disabled():
+            return None
+        try:
+            return _l2_normalize(self.embed(text))
+        except Exception as e:
+            self._embed_disabled_until = time.monotonic() + self.embed_retry_after
+            logger.warning(
+                f"Semantic cache embedding failed, using exact matches for "
+                f"{self.embed_retry_after:.0f}s: {e}"
+            )
+            return None
+
+    def _remember_vector(self, text: str, vector: Optional[List[float]]) -> None:
+        self._vectors[text] = vector
+        self._vectors.move_to_end(text)
+        while len(self._vectors) > self.maxsize:
+            self._vectors.popitem(last=False)
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed normalized query text, reusing a memoized vector if present"""
+        if self.embed is None:
+            return None
+        if text in self._vectors:
+            self._vectors.move_to_end(text)
+            return self._vectors[text]
+        vector = self._compute_vector(text)
+        if vector is not None:
+            self._remember_vector(text, vector)
+        return vector
+
+    async def _prepare(self, text: str) -> None:
+        """Embed query text in a worker thread ahead of a get/set"""
+        if self.embed is None or self._embedding_disabled():
+            return
+        text = normalize_query(text)
+        if text in self._vectors:
+            return
+        loop = asyncio.get_running_loop()
+        vector = await loop.run_in_executor(None, self._compute_vector, text)
+        if vector is not None:
+            self._remember_vector(text, vector)
+
+    def get(self, namespace: Hashable, text: str) -> Optional[Any]:
+        """
+        Look up a cached response
+
+        Args:
+            namespace: Query shape the response belongs to
+            text: Query text
+
+        Returns:
+            Cached response, or None on miss
+        """
+        now = time.monotonic()
+        key = (namespace, normalize_query(text))
+
+        value = self._exact(key, now)
+        if value is not _MISS:
+            return value
+
+        query_vector = self._embed(key[1])
+        if query_vector is None:
+            return None
+
+        best_key, best_score = _best_match(
+            query_vector, self._candidates(namespace, now), self.threshold
+        )
+        return self._promote(best_key, best_score, text)
+
+    def _exact(self, key: Tuple[Hashable, str], now: float) -> Any:
+        """Unexpired response stored under exactly this key, or _MISS"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISS
+        if entry[2] <= now:
+            del self._entries[key]
+            return _MISS
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _candidates(self, namespace: Hashable, now: float) -> List[Tuple[Hashable, List[float]]]:
+        """Snapshot of the most recently used live entries to compare against"""
+        candidates = []
+        for entry_key in reversed(self._entries):
+            vector, _, expires = self._entries[entry_key]
+            if entry_key[0] != namespace or vector is None or expires <= now:
+                continue
+            candidates.append((entry_key, vector))
+            if len(candidates) >= self.max_scan:
+                break
+        return candidates
+
+    def _promote(self, key: Optional[Hashable], score: float, text: str) -> Optional[Any]:
+        """Return a semantic match and mark it recently used"""
+        # The entry may have been evicted while an async scan was running
+        if key is None or key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        logger.debug(f"Semantic cache hit ({score:.3f}) for query: {text}")
+        return self._entries[key][1]
+
+    def set(self, namespace: Hashable, text: str, value: Any) -> None:
+        """
+        Store a response
+
+        Args:
+            namespace: Query shape the response belongs to
+            text: Query text
+            value: Response to cache
+        """
+        key = (namespace, normalize_query(text))
+        vector = self._embed(key[1])
+        self._entries[key] = (vector, value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def aget(self, namespace: Hashable, text: str) -> Optional[Any]:
+        """Async variant of get() that embeds and scans off the event loop"""
+        key = (namespace, normalize_query(text))
+        value = self._exact(key, time.monotonic())
+        if value is not _MISS:
+            return value
+
+        await self._prepare(text)
+        query_vector = self._vectors.get(key[1])
+        if query_vector is None:
+            return None
+
+        candidates = self._candidates(namespace, time.monotonic())
+        best_key, best_score = await asyncio.to_thread(
+            _best_match, query_vector, candidates, self.threshold
+        )
+        return self._promote(best_key, best_score, text)
+
+    async def aset(self, namespace: Hashable, text: str, value: Any) -> None:
+        """Async variant of set() that embeds off the event loop"""
+        await self._prepare(text)
+        self.set(namespace, text, value)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._entries.clear()
+        self._vectors.clear()
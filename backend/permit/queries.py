@@ -1,26 +1,392 @@
 """
 CosmosDB queries for permit metadata
 Handles temporal data queries (issue dates, expiration dates, etc.)
+
+Cosmos errors are logged and re-raised rather than returned as an empty
+result, so callers (and their caches) can tell a failed query from a miss.
 """
+import inspect
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Literal
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Literal, Tuple, TypeVar, Union
+from azure.cosmos.aio import ContainerProxy as AsyncContainerProxy
 from azure.cosmos.container import ContainerProxy
+from cachetools import TTLCache
 
 # Import dari backend.client
-from backend.client import get_permit_container
+from backend.client import get_permit_container, get_permit_container_async
 
 logger = logging.getLogger(__name__)
 
+_EXPIRATION_DATE = itemgetter('expirationDate')
+_MISSING = object()
+T = TypeVar("T")
+
+# Indexing policy the queries in this module are written against. Every
+# filtered/projected path is range-indexed (the year and expiry filters are
+# string range predicates), and the long summary text is excluded since it
+# is only ever projected, never filtered. Apply when provisioning the permit
+# container, e.g. database.create_container(..., indexing_policy=PERMIT_INDEXING_POLICY)
+PERMIT_INDEXING_POLICY: Dict[str, Any] = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [
+        {"path": "/documentTitle/?"},
+        {"path": "/permitType/?"},
+        {"path": "/organization/?"},
+        {"path": "/filepath/?"},
+        {"path": "/permits/[]/issueDate/?"},
+        {"path": "/permits/[]/expirationDate/?"},
+        {"path": "/permits/[]/permitNumber/?"},
+        {"path": "/permits/[]/installation/?"}
+    ],
+    "excludedPaths": [
+        {"path": "/permits/[]/permitSummary/?"},
+        {"path": "/*"},
+        {"path": '/"_etag"/?'}
+    ]
+}
+
+# Read-mostly aggregates, cached per container for a few minutes
+AGGREGATE_CACHE_TTL = 300
+_organizations_cache: TTLCache = TTLCache(maxsize=8, ttl=AGGREGATE_CACHE_TTL)
+_statistics_cache: TTLCache = TTLCache(maxsize=8, ttl=AGGREGATE_CACHE_TTL)
+_aggregate_cache_lock = threading.Lock()
+
+# Short-lived results of the list/lookup queries, keyed by function and
+# arguments; only used when the caller relies on the default container
+QUERY_CACHE_TTL = 60
+_query_cache: TTLCache = TTLCache(maxsize=1024, ttl=QUERY_CACHE_TTL)
+_query_cache_lock = threading.Lock()
+
+# Running estimate (EMA) of how many rows each query shape returns, used to
+# size cross-partition pages; keyed by value-insensitive fingerprints
+SELECTIVITY_CACHE_SIZE = 256
+SELECTIVITY_EMA_ALPHA = 0.3
+NON_SELECTIVE_ROW_THRESHOLD = 100
+NON_SELECTIVE_PAGE_SIZE = 1000
+_selectivity: "OrderedDict[Tuple[Any, ...], float]" = OrderedDict()
+_selectivity_lock = threading.Lock()
+
+# Installations per batched query; Cosmos allows at most 256 parameters
+INSTALLATION_BATCH_SIZE = 200
+
+# Partition key paths per container id, read once from the container
+# properties so lookups are only scoped when the key really is /organization
+# (a failed read is remembered as no paths and retried after
+# PARTITION_KEY_RETRY_AFTER seconds)
+ORGANIZATION_PARTITION_KEY = ["/organization"]
+PARTITION_KEY_RETRY_AFTER = 60.0
+_partition_key_paths: Dict[str, Tuple[List[str], float]] = {}
+_partition_key_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_container() -> ContainerProxy:
+    """Permit container shared by all queries, resolved on first use"""
+    return get_permit_container()
+
+
+def _partitioned_by_organization(container: ContainerProxy) -> bool:
+    """
+    Whether the container's partition key is /organization
+    
+    Read from the container properties on first use; if they can't be read
+    the answer is False, so callers fall back to a cross-partition query,
+    and the read isn't attempted again for PARTITION_KEY_RETRY_AFTER seconds.
+    """
+    now = time.monotonic()
+    with _partition_key_lock:
+        paths, retry_at = _partition_key_paths.get(container.id, (None, 0.0))
+    if paths is None or (not paths and now >= retry_at):
+        try:
+            paths, retry_at = container.read()['partitionKey']['paths'], float('inf')
+        except Exception as e:
+            logger.warning(f"Could not read partition key of container {container.id}: {e}")
+            paths, retry_at = [], now + PARTITION_KEY_RETRY_AFTER
+        with _partition_key_lock:
+            _partition_key_paths[container.id] = (paths, retry_at)
+    return paths == ORGANIZATION_PARTITION_KEY
+
+
+def invalidate_stats_cache() -> None:
+    """
+    Drop cached organization lists and permit statistics
+    Call after writing permit metadata so the next read goes to Cosmos
+    """
+    with _aggregate_cache_lock:
+        _organizations_cache.clear()
+        _statistics_cache.clear()
+
+
+def invalidate_all() -> None:
+    """
+    Drop every cached query result, including the aggregate caches
+    Call from ingest after writing permit metadata
+    """
+    with _query_cache_lock:
+        _query_cache.clear()
+    invalidate_stats_cache()
+
+
+def _cached_query(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Serve repeated calls with identical arguments from the query cache
+    
+    Calls that pass their own container bypass the cache, as do streaming
+    calls. Errors propagate and are never stored; empty results aren't
+    stored either. Cached lists are shared between callers and must be
+    treated as read-only.
+    """
+    signature = inspect.signature(func)
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if arguments.pop('container') is not None or arguments.get('stream'):
+            return func(*args, **kwargs)
+        
+        key = (func.__name__,) + tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in arguments.values()
+        )
+        with _query_cache_lock:
+            cached = _query_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        result = func(*args, **kwargs)
+        if result:
+            with _query_cache_lock:
+                _query_cache[key] = result
+        return result
+    
+    return wrapper
+
+
+@lru_cache(maxsize=16)
+def _iso_date_for_minute(minute: int, days: int) -> str:
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+def _iso_date(days: int = 0) -> str:
+    """Today's date (optionally shifted by days) as YYYY-MM-DD, recomputed once a minute"""
+    return _iso_date_for_minute(int(time.time() // 60), days)
+
+
+def _summary_column(include_summary: bool) -> str:
+    """Projection fragment for the (long) permit summary text, if wanted"""
+    return " p.permitSummary," if include_summary else ""
+
+
+@lru_cache(maxsize=64)
+def _build_date_field_clause(
+    date_field: str,
+    has_type: bool,
+    year_operator: Optional[str],
+    has_org: bool
+) -> str:
+    """
+    Compose the FROM/JOIN/WHERE clause of a date-field year query
+    
+    The year filter compares the stored YYYY-MM-DD string against year
+    boundaries, which the range index can serve, unlike YEAR(field) which is
+    evaluated per document.
+    """
+    conditions = []
+    if has_type:
+        conditions.append("c.permitType = @permitType")
+    if year_operator and year_operator != 'less':
+        conditions.append(f"p.{date_field} >= @yearStart")
+    if year_operator and year_operator != 'greater':
+        conditions.append(f"p.{date_field} < @yearEnd")
+    if has_org:
+        conditions.append("c.organization = @organization")
+    
+    clause = """
+        FROM c
+        JOIN p IN c.permits
+    """
+    if conditions:
+        clause += " WHERE " + " AND ".join(conditions)
+    return clause
+
+
+@lru_cache(maxsize=64)
+def _build_date_field_query(
+    date_field: str,
+    has_type: bool,
+    year_operator: Optional[str],
+    has_org: bool,
+    include_summary: bool
+) -> str:
+    """Compose the SQL for a date-field year query once per query shape"""
+    return f"""
+        SELECT c.documentTitle, c.permitType, c.organization, 
+               p.{date_field},{_summary_column(include_summary)} p.permitNumber
+    """ + _build_date_field_clause(date_field, has_type, year_operator, has_org)
+
+
+def _query_by_date_field(
+    container: Optional[ContainerProxy],
+    date_field: Literal['issueDate', 'expirationDate'],
+    permit_type: Optional[str],
+    year: Optional[int],
+    organization: Optional[str],
+    operator: Optional[str],
+    order_by: str,
+    top: Optional[int],
+    offset: int,
+    include_summary: bool,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], int]:
+    """Shared implementation of the issue/expiration year queries"""
+    # Auto-initialize container if not provided
+    container = container or _get_container()
+    
+    year_operator = operator if operator and year else None
+    
+    parameters = []
+    if permit_type:
+        parameters.append({"name": "@permitType", "value": permit_type})
+    if year_operator and year_operator != 'less':
+        parameters.append({"name": "@yearStart", "value": f"{int(year):04d}-01-01"})
+    if year_operator and year_operator != 'greater':
+        parameters.append({"name": "@yearEnd", "value": f"{int(year) + 1:04d}-01-01"})
+    if organization:
+        parameters.append({"name": "@organization", "value": organization})
+    
+    label = "issue year" if date_field == 'issueDate' else "expiration year"
+    if count_only:
+        clause = _build_date_field_clause(
+            date_field, bool(permit_type), year_operator, bool(organization)
+        )
+        return _count_matches(container, clause, parameters, f"documents by {label}")
+    
+    query = _build_date_field_query(
+        date_field, bool(permit_type), year_operator, bool(organization), include_summary
+    )
+    shape = (date_field, permit_type, operator, organization is None)
+    
+    try:
+        results = container.query_items(
+            query=query,
+            parameters=parameters,
+            **_cross_partition_options(shape)
+        )
+
+        items = list(results)
+        _record_selectivity(shape, len(items))
+        
+        # A year filter guarantees the date is projected; without one a
+        # permit may lack it, and Cosmos omits undefined fields from rows
+        items.sort(
+            key=itemgetter(date_field) if year_operator else (lambda x: x.get(date_field, '')),
+            reverse=(order_by == 'latest')
+        )
+        
+        logger.info(f"Found {len(items)} documents by {label}")
+        return _paginate(items, top, offset)
+    
+    except Exception as e:
+        logger.error(f"Error querying documents by {label}: {e}")
+        raise
+
+
+def _cross_partition_options(shape: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Feed options for a cross-partition query of the given shape
+    
+    Shapes that historically return many rows get large pages, so the fan-out
+    needs fewer round-trips per partition. Selective shapes keep the SDK
+    default page size and don't prefetch rows they won't use.
+    """
+    with _selectivity_lock:
+        estimate = _selectivity.get(shape)
+        if estimate is not None:
+            _selectivity.move_to_end(shape)
+    
+    options: Dict[str, Any] = {"enable_cross_partition_query": True}
+    if estimate is not None and estimate > NON_SELECTIVE_ROW_THRESHOLD:
+        options["max_item_count"] = NON_SELECTIVE_PAGE_SIZE
+    return options
+
+
+def _record_selectivity(shape: Tuple[Any, ...], row_count: int) -> None:
+    """Fold an observed result size into the shape's running estimate"""
+    with _selectivity_lock:
+        previous = _selectivity.get(shape)
+        if previous is None:
+            _selectivity[shape] = float(row_count)
+        else:
+            _selectivity[shape] = previous + SELECTIVITY_EMA_ALPHA * (row_count - previous)
+        _selectivity.move_to_end(shape)
+        while len(_selectivity) > SELECTIVITY_CACHE_SIZE:
+            _selectivity.popitem(last=False)
+
+
+def _paginate(
+    items: List[Dict[str, Any]],
+    top: Optional[int],
+    offset: int
+) -> List[Dict[str, Any]]:
+    """Return one page of already-sorted items"""
+    if top is None:
+        return items[offset:] if offset else items
+    return items[offset:offset + top]
+
+
+def _count_matches(
+    container: ContainerProxy,
+    clause: str,
+    parameters: List[Dict[str, Any]],
+    label: str
+) -> int:
+    """
+    Count the rows a list query matches without fetching them
+    
+    Projects SELECT VALUE COUNT(1) over the list query's FROM/JOIN/WHERE
+    clause, so Cosmos returns a number instead of documents.
+    """
+    count_query = "SELECT VALUE COUNT(1) " + clause
+    
+    try:
+        results = container.query_items(
+            query=count_query,
+            parameters=parameters,
+            enable_cross_partition_query=True
+        )
+        # Partial counts, should the SDK return one per partition, add up
+        count = sum(results)
+        
+        logger.info(f"Counted {count} {label}")
+        return count
+    
+    except Exception as e:
+        logger.error(f"Error counting {label}: {e}")
+        raise
+
 
+@_cached_query
 def query_documents_by_issue_year(
     container: Optional[ContainerProxy] = None,
     permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
     year: Optional[int] = None,
     organization: Optional[str] = None,
     operator: Optional[Literal['equal', 'greater', 'less']] = None,
-    order_by: str = 'latest'
-) -> List[Dict[str, Any]]:
+    order_by: str = 'latest',
+    top: Optional[int] = None,
+    offset: int = 0,
+    include_summary: bool = False,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], int]:
     """
     Query documents by issue year from CosmosDB
     
@@ -31,9 +397,13 @@ def query_documents_by_issue_year(
         organization: Organization to filter
         operator: Comparison operator for year
         order_by: Sort order ('latest' or 'earliest')
+        top: Maximum number of documents to return (all if None)
+        offset: Number of sorted documents to skip
+        include_summary: Also return the permit summary text
+        count_only: Return only the number of matching documents
         
     Returns:
-        List of matching documents
+        List of matching documents (their count, if count_only=True)
         
     Example:
         >>> results = query_documents_by_issue_year(
@@ -43,70 +413,25 @@ def query_documents_by_issue_year(
         ...     organization='PPN'
         ... )
     """
-    # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
-    
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, 
-               p.issueDate, p.permitSummary, p.permitNumber
-        FROM c
-        JOIN p IN c.permits
-    """
-    
-    conditions = []
-    parameters = []
-
-    if permit_type:
-        conditions.append("c.permitType = @permitType")
-        parameters.append(dict(name="@permitType", value=permit_type))
-
-    if operator and year:
-        parameters.append(dict(name="@year", value=year))
-        if operator == 'greater':
-            conditions.append("YEAR(p.issueDate) >= @year")
-        elif operator == 'less':
-            conditions.append("YEAR(p.issueDate) <= @year")
-        else:
-            conditions.append("YEAR(p.issueDate) = @year")
-        
-    if organization:
-        conditions.append("c.organization = @organization")
-        parameters.append(dict(name="@organization", value=organization))
-
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-
-    try:
-        results = container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        )
-
-        items = [item for item in results]
-        
-        if order_by == 'latest':
-            items.sort(key=lambda x: x.get('issueDate', ''), reverse=True)
-        else:
-            items.sort(key=lambda x: x.get('issueDate', ''))
-        
-        logger.info(f"Found {len(items)} documents by issue year")
-        return items
-    
-    except Exception as e:
-        logger.error(f"Error querying documents by issue year: {e}")
-        return []
+    return _query_by_date_field(
+        container, 'issueDate', permit_type, year, organization,
+        operator, order_by, top, offset, include_summary, count_only
+    )
 
 
+@_cached_query
 def query_documents_by_expiration_year(
     container: Optional[ContainerProxy] = None,
     permit_type: Optional[Literal['PLO']] = None,
     year: Optional[int] = None,
     organization: Optional[str] = None,
     operator: Optional[Literal['equal', 'greater', 'less']] = None,
-    order_by: str = 'latest'
-) -> List[Dict[str, Any]]:
+    order_by: str = 'latest',
+    top: Optional[int] = None,
+    offset: int = 0,
+    include_summary: bool = False,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], int]:
     """
     Query documents by expiration year from CosmosDB
     
@@ -117,9 +442,13 @@ def query_documents_by_expiration_year(
         organization: Organization to filter
         operator: Comparison operator for year
         order_by: Sort order ('latest' or 'earliest')
+        top: Maximum number of documents to return (all if None)
+        offset: Number of sorted documents to skip
+        include_summary: Also return the permit summary text
+        count_only: Return only the number of matching documents
         
     Returns:
-        List of matching documents
+        List of matching documents (their count, if count_only=True)
         
     Example:
         >>> results = query_documents_by_expiration_year(
@@ -129,67 +458,22 @@ def query_documents_by_expiration_year(
         ...     organization='PGN'
         ... )
     """
-    # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
-    
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, 
-               p.expirationDate, p.permitSummary, p.permitNumber
-        FROM c
-        JOIN p IN c.permits
-    """
-    
-    conditions = []
-    parameters = []
-
-    if permit_type:
-        conditions.append("c.permitType = @permitType")
-        parameters.append(dict(name="@permitType", value=permit_type))
-
-    if operator and year:
-        parameters.append(dict(name="@year", value=year))
-        if operator == 'greater':
-            conditions.append("YEAR(p.expirationDate) >= @year")
-        elif operator == 'less':
-            conditions.append("YEAR(p.expirationDate) <= @year")
-        else:
-            conditions.append("YEAR(p.expirationDate) = @year")
-
-    if organization:
-        conditions.append("c.organization = @organization")
-        parameters.append(dict(name="@organization", value=organization))
-
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-
-    try:
-        results = container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        )
-
-        items = [item for item in results]
-        
-        if order_by == 'latest':
-            items.sort(key=lambda x: x.get('expirationDate', ''), reverse=True)
-        else:
-            items.sort(key=lambda x: x.get('expirationDate', ''))
-        
-        logger.info(f"Found {len(items)} documents by expiration year")
-        return items
-    
-    except Exception as e:
-        logger.error(f"Error querying documents by expiration year: {e}")
-        return []
+    return _query_by_date_field(
+        container, 'expirationDate', permit_type, year, organization,
+        operator, order_by, top, offset, include_summary, count_only
+    )
 
 
+@_cached_query
 def query_expired_documents(
     container: Optional[ContainerProxy] = None,
     organization: Optional[str] = None,
-    order_by: str = 'latest'
-) -> List[Dict[str, Any]]:
+    order_by: str = 'latest',
+    top: Optional[int] = None,
+    offset: int = 0,
+    include_summary: bool = False,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], int]:
     """
     Query documents that have already expired
     
@@ -197,9 +481,13 @@ def query_expired_documents(
         container: CosmosDB container (auto-initialized if None)
         organization: Organization to filter (optional)
         order_by: Sort order ('latest' or 'earliest')
+        top: Maximum number of documents to return (all if None)
+        offset: Number of sorted documents to skip
+        include_summary: Also return the permit summary text
+        count_only: Return only the number of expired documents
         
     Returns:
-        List of expired documents
+        List of expired documents (their count, if count_only=True)
         
     Example:
         >>> expired = query_expired_documents(organization='KPI')
@@ -207,52 +495,63 @@ def query_expired_documents(
         ...     print(f"{doc['permitNumber']} expired on {doc['expirationDate']}")
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
     
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    parameters = [dict(name="@currentDate", value=current_date)]
+    current_date = _iso_date()
+    parameters = [{"name": "@currentDate", "value": current_date}]
     
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
-               p.expirationDate, p.permitSummary, p.permitNumber, p.installation
+    clause = """
         FROM c
         JOIN p in c.permits
         WHERE p.expirationDate < @currentDate AND c.permitType = 'PLO'
     """
     
     if organization:
-        query += " AND c.organization = @organization"
-        parameters.append(dict(name="@organization", value=organization))
+        clause += " AND c.organization = @organization"
+        parameters.append({"name": "@organization", "value": organization})
+    
+    if count_only:
+        return _count_matches(container, clause, parameters, "expired documents")
+    
+    query = f"""
+        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
+               p.expirationDate,{_summary_column(include_summary)} p.permitNumber, p.installation
+    """ + clause
+    
+    shape = ('expired', organization is None)
     
     try:
         results = container.query_items(
             query=query,
             parameters=parameters,
-            enable_cross_partition_query=True
+            **_cross_partition_options(shape)
         )
         
-        items = [item for item in results]
+        items = list(results)
+        _record_selectivity(shape, len(items))
         
-        if order_by == 'latest':
-            items.sort(key=lambda x: x.get('expirationDate', ''), reverse=True)
-        else:
-            items.sort(key=lambda x: x.get('expirationDate', ''))
+        # The WHERE clause only matches permits with an expirationDate
+        items.sort(key=_EXPIRATION_DATE, reverse=(order_by == 'latest'))
         
         logger.info(f"Found {len(items)} expired documents")
-        return items
+        return _paginate(items, top, offset)
     
     except Exception as e:
         logger.error(f"Error querying expired documents: {e}")
-        return []
+        raise
 
 
+@_cached_query
 def query_documents_expiring_soon(
     container: Optional[ContainerProxy] = None,
     days: int = 30,
     organization: Optional[str] = None,
-    order_by: str = 'earliest'
-) -> List[Dict[str, Any]]:
+    order_by: str = 'earliest',
+    top: Optional[int] = None,
+    offset: int = 0,
+    include_summary: bool = False,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], int]:
     """
     Query documents that will expire within specified number of days
     
@@ -261,33 +560,32 @@ def query_documents_expiring_soon(
         days: Number of days to look ahead (default 30)
         organization: Organization to filter (optional)
         order_by: Sort order ('latest' or 'earliest')
+        top: Maximum number of documents to return (all if None)
+        offset: Number of sorted documents to skip
+        include_summary: Also return the permit summary text
+        count_only: Return only the number of documents expiring soon
         
     Returns:
-        List of documents expiring soon
+        List of documents expiring soon, each with daysRemaining (whole days
+        from today until its expirationDate); their count, if count_only=True
         
     Example:
         >>> soon_expire = query_documents_expiring_soon(days=60, organization='SHU')
         >>> for doc in soon_expire:
-        ...     print(f"{doc['permitNumber']} expires in {days} days")
+        ...     print(f"{doc['permitNumber']} expires in {doc['daysRemaining']} days")
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
     
-    current_date = datetime.now()
-    future_date = datetime.now()
-    from datetime import timedelta
-    future_date = (current_date + timedelta(days=days)).strftime("%Y-%m-%d")
-    current_date_str = current_date.strftime("%Y-%m-%d")
+    current_date = _iso_date()
+    future_date = _iso_date(days)
     
     parameters = [
-        dict(name="@currentDate", value=current_date_str),
-        dict(name="@futureDate", value=future_date)
+        {"name": "@currentDate", "value": current_date},
+        {"name": "@futureDate", "value": future_date}
     ]
     
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
-               p.expirationDate, p.permitSummary, p.permitNumber, p.installation
+    clause = """
         FROM c
         JOIN p in c.permits
         WHERE p.expirationDate >= @currentDate 
@@ -296,104 +594,159 @@ def query_documents_expiring_soon(
     """
     
     if organization:
-        query += " AND c.organization = @organization"
-        parameters.append(dict(name="@organization", value=organization))
+        clause += " AND c.organization = @organization"
+        parameters.append({"name": "@organization", "value": organization})
+    
+    if count_only:
+        return _count_matches(
+            container, clause, parameters, f"documents expiring within {days} days"
+        )
+    
+    query = f"""
+        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
+               p.expirationDate,{_summary_column(include_summary)} p.permitNumber, p.installation,
+               DateTimeDiff('day', CONCAT(@currentDate, 'T00:00:00Z'),
+                            CONCAT(p.expirationDate, 'T00:00:00Z')) AS daysRemaining
+    """ + clause
+    
+    shape = ('expiring_soon', organization is None)
     
     try:
         results = container.query_items(
             query=query,
             parameters=parameters,
-            enable_cross_partition_query=True
+            **_cross_partition_options(shape)
         )
         
-        items = [item for item in results]
+        items = list(results)
+        _record_selectivity(shape, len(items))
         
-        if order_by == 'latest':
-            items.sort(key=lambda x: x.get('expirationDate', ''), reverse=True)
-        else:
-            items.sort(key=lambda x: x.get('expirationDate', ''))
+        # The WHERE clause only matches permits with an expirationDate
+        items.sort(key=_EXPIRATION_DATE, reverse=(order_by == 'latest'))
         
         logger.info(f"Found {len(items)} documents expiring within {days} days")
-        return items
+        return _paginate(items, top, offset)
     
     except Exception as e:
         logger.error(f"Error querying documents expiring soon: {e}")
-        return []
+        raise
 
 
+@_cached_query
 def query_permit_by_number(
     container: Optional[ContainerProxy] = None,
-    permit_number: str = None
+    permit_number: str = None,
+    organization: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query specific permit by permit number
     
+    When the owning organization is known and the container is partitioned
+    on /organization (checked against the container properties), the query
+    is scoped to that partition instead of fanning out across every physical
+    partition. Otherwise the organization is only used as a filter.
+    
     Args:
         container: CosmosDB container (auto-initialized if None)
         permit_number: Permit number to search for
+        organization: Organization owning the permit (optional)
         
     Returns:
         Permit document if found, None otherwise
         
     Example:
-        >>> permit = query_permit_by_number(permit_number='PLO-2024-001')
+        >>> permit = query_permit_by_number(permit_number='PLO-2024-001', organization='PPN')
         >>> if permit:
         ...     print(f"Found: {permit['documentTitle']}")
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
     
     if not permit_number:
         logger.warning("Permit number is required")
         return None
     
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
+    single_partition = bool(organization) and _partitioned_by_organization(container)
+    
+    # TOP makes a cross-partition query need a gateway query plan (an extra
+    # round-trip), so it is only used when the query targets one partition;
+    # otherwise the first row is taken from the lazily paged results
+    top_clause = "TOP 1 " if single_partition else ""
+    query = f"""
+        SELECT {top_clause}c.documentTitle, c.permitType, c.organization, c.filepath,
                p.issueDate, p.expirationDate, p.permitSummary, p.permitNumber, p.installation
         FROM c
         JOIN p in c.permits
         WHERE p.permitNumber = @permitNumber
     """
     
-    parameters = [dict(name="@permitNumber", value=permit_number)]
+    parameters = [{"name": "@permitNumber", "value": permit_number}]
+    
+    if organization:
+        query += " AND c.organization = @organization"
+        parameters.append({"name": "@organization", "value": organization})
+    
+    if single_partition:
+        scope = {"partition_key": organization}
+    else:
+        scope = {"enable_cross_partition_query": True}
     
     try:
         results = container.query_items(
             query=query,
             parameters=parameters,
-            enable_cross_partition_query=True
+            **scope
         )
         
-        items = [item for item in results]
+        permit = next(iter(results), None)
         
-        if items:
+        if permit:
             logger.info(f"Found permit: {permit_number}")
-            return items[0]
+            return permit
         else:
             logger.warning(f"Permit not found: {permit_number}")
             return None
     
     except Exception as e:
         logger.error(f"Error querying permit by number: {e}")
-        return None
+        raise
 
 
+@_cached_query
 def query_permits_by_installation(
     container: Optional[ContainerProxy] = None,
     installation: str = None,
-    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None
-) -> List[Dict[str, Any]]:
+    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
+    top: Optional[int] = None,
+    offset: int = 0,
+    stream: bool = False,
+    include_summary: bool = False,
+    max_item_count: Optional[int] = None,
+    count_only: bool = False
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]], int]:
     """
     Query permits by installation location
     
+    Matching is a case-insensitive substring match. It uses CONTAINS with
+    the ignore-case flag rather than LOWER() on both sides, so Cosmos can
+    evaluate it against the index instead of lowercasing every permit.
+    
     Args:
         container: CosmosDB container (auto-initialized if None)
         installation: Installation location to search for
         permit_type: Type of permit to filter (optional)
+        top: Maximum number of permits to return (all if None)
+        offset: Number of permits to skip
+        stream: Return a lazy iterator that fetches pages as it is consumed
+            instead of a list (query errors then surface during iteration)
+        include_summary: Also return the permit summary text
+        max_item_count: Rows fetched per page (SDK/selectivity default if None)
+        count_only: Return only the number of matching permits (ignores
+            top, offset and stream)
         
     Returns:
-        List of permits for the installation
+        List (or iterator, if stream=True) of permits for the installation,
+        or their count if count_only=True
         
     Example:
         >>> permits = query_permits_by_installation(
@@ -402,42 +755,210 @@ def query_permits_by_installation(
         ... )
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
     
     if not installation:
         logger.warning("Installation name is required")
         return []
     
-    query = """
-        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
-               p.issueDate, p.expirationDate, p.permitSummary, p.permitNumber, p.installation
+    clause = """
         FROM c
         JOIN p in c.permits
-        WHERE CONTAINS(LOWER(p.installation), LOWER(@installation))
+        WHERE CONTAINS(p.installation, @installation, true)
     """
     
-    parameters = [dict(name="@installation", value=installation)]
+    parameters = [{"name": "@installation", "value": installation}]
     
     if permit_type:
-        query += " AND c.permitType = @permitType"
-        parameters.append(dict(name="@permitType", value=permit_type))
+        clause += " AND c.permitType = @permitType"
+        parameters.append({"name": "@permitType", "value": permit_type})
+    
+    if count_only:
+        return _count_matches(
+            container, clause, parameters, f"permits for installation: {installation}"
+        )
+    
+    query = f"""
+        SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
+               p.issueDate, p.expirationDate,{_summary_column(include_summary)} p.permitNumber, p.installation
+    """ + clause
+    
+    # Unsorted results can be paged server-side, so only the requested
+    # page is read and returned by Cosmos
+    if top is not None:
+        query += f" OFFSET {int(offset)} LIMIT {int(top)}"
+    
+    shape = ('installation', permit_type, top is None)
+    options = _cross_partition_options(shape)
+    if max_item_count:
+        options["max_item_count"] = max_item_count
     
     try:
         results = container.query_items(
             query=query,
             parameters=parameters,
-            enable_cross_partition_query=True
+            **options
         )
         
-        items = [item for item in results]
+        if stream:
+            return iter(results)
+        
+        items = list(results)
+        _record_selectivity(shape, len(items))
         
         logger.info(f"Found {len(items)} permits for installation: {installation}")
         return items
     
     except Exception as e:
         logger.error(f"Error querying permits by installation: {e}")
+        raise
+
+
+@_cached_query
+def query_permits_by_installations(
+    container: Optional[ContainerProxy] = None,
+    installations: Optional[List[str]] = None,
+    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
+    include_summary: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Query permits for several installation locations at once
+    
+    Uses the same case-insensitive substring match as
+    query_permits_by_installation, but ORs the installations into one query
+    per batch of INSTALLATION_BATCH_SIZE, so N installations cost
+    ceil(N / INSTALLATION_BATCH_SIZE) cross-partition queries instead of N.
+    
+    Args:
+        container: CosmosDB container (auto-initialized if None)
+        installations: Installation locations to search for
+        permit_type: Type of permit to filter (optional)
+        include_summary: Also return the permit summary text
+        
+    Returns:
+        List of permits matching any of the installations, without duplicates
+        
+    Example:
+        >>> permits = query_permits_by_installations(
+        ...     installations=['IT Semarang', 'TBBM Rewulu'],
+        ...     permit_type='PLO'
+        ... )
+    """
+    # Auto-initialize container if not provided
+    container = container or _get_container()
+    
+    installations = list(dict.fromkeys(i for i in installations or [] if i))
+    if not installations:
+        logger.warning("At least one installation name is required")
         return []
+    
+    items = []
+    seen = set()
+    
+    try:
+        for start in range(0, len(installations), INSTALLATION_BATCH_SIZE):
+            batch = installations[start:start + INSTALLATION_BATCH_SIZE]
+            
+            parameters = [
+                {"name": f"@i{index}", "value": installation}
+                for index, installation in enumerate(batch)
+            ]
+            matches = " OR ".join(
+                f"CONTAINS(p.installation, @i{index}, true)" for index in range(len(batch))
+            )
+            query = f"""
+                SELECT c.documentTitle, c.permitType, c.organization, c.filepath,
+                       p.issueDate, p.expirationDate,{_summary_column(include_summary)} p.permitNumber, p.installation
+                FROM c
+                JOIN p in c.permits
+                WHERE ({matches})
+            """
+            
+            if permit_type:
+                query += " AND c.permitType = @permitType"
+                parameters.append({"name": "@permitType", "value": permit_type})
+            
+            results = container.query_items(
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=True
+            )
+            
+            # A permit can match installations from more than one batch
+            for item in results:
+                key = (item.get('filepath'), item.get('permitNumber'), item.get('installation'))
+                if key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        
+        logger.info(f"Found {len(items)} permits for {len(installations)} installations")
+        return items
+    
+    except Exception as e:
+        logger.error(f"Error querying permits by installations: {e}")
+        raise
+
+
+@_cached_query
+def list_permit_numbers(
+    container: Optional[ContainerProxy] = None,
+    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
+    organization: Optional[str] = None
+) -> List[str]:
+    """
+    List permit numbers without fetching the rest of each permit
+    
+    Uses SELECT VALUE, so Cosmos returns bare strings instead of one JSON
+    object per row.
+    
+    Args:
+        container: CosmosDB container (auto-initialized if None)
+        permit_type: Type of permit to filter (optional)
+        organization: Organization to filter (optional)
+        
+    Returns:
+        List of permit numbers
+        
+    Example:
+        >>> numbers = list_permit_numbers(permit_type='PLO', organization='PPN')
+    """
+    # Auto-initialize container if not provided
+    container = container or _get_container()
+    
+    query = """
+        SELECT VALUE p.permitNumber
+        FROM c
+        JOIN p IN c.permits
+        WHERE IS_DEFINED(p.permitNumber)
+    """
+    parameters = []
+    
+    if permit_type:
+        query += " AND c.permitType = @permitType"
+        parameters.append({"name": "@permitType", "value": permit_type})
+    
+    if organization:
+        query += " AND c.organization = @organization"
+        parameters.append({"name": "@organization", "value": organization})
+    
+    shape = ('permit_numbers', permit_type, organization is None)
+    
+    try:
+        results = container.query_items(
+            query=query,
+            parameters=parameters,
+            **_cross_partition_options(shape)
+        )
+        
+        numbers = list(results)
+        _record_selectivity(shape, len(numbers))
+        
+        logger.info(f"Found {len(numbers)} permit numbers")
+        return numbers
+    
+    except Exception as e:
+        logger.error(f"Error listing permit numbers: {e}")
+        raise
 
 
 def get_all_organizations(
@@ -445,6 +966,7 @@ def get_all_organizations(
 ) -> List[str]:
     """
     Get list of all unique organizations in the database
+    Results are cached per container for AGGREGATE_CACHE_TTL seconds
     
     Args:
         container: CosmosDB container (auto-initialized if None)
@@ -457,8 +979,12 @@ def get_all_organizations(
         >>> print(orgs)  # ['PPN', 'PGN', 'KPI', 'SHU']
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
+    
+    with _aggregate_cache_lock:
+        cached = _organizations_cache.get(container.id)
+    if cached is not None:
+        return cached
     
     query = """
         SELECT DISTINCT VALUE c.organization
@@ -472,14 +998,60 @@ def get_all_organizations(
             enable_cross_partition_query=True
         )
         
-        organizations = [item for item in results]
+        organizations = sorted(results)
+        
+        with _aggregate_cache_lock:
+            _organizations_cache[container.id] = organizations
         
         logger.info(f"Found {len(organizations)} organizations")
-        return sorted(organizations)
+        return organizations
     
     except Exception as e:
         logger.error(f"Error getting organizations: {e}")
-        return []
+        raise
+
+
+# The pinned SDK can't run GROUP BY across partitions, so statistics come
+# from one cross-partition pass over the three fields they need, tallied
+# in Python by _summarize_statistics
+_STATISTICS_QUERY = """
+    SELECT c.permitType, c.organization, p.expirationDate
+    FROM c
+    JOIN p IN c.permits
+"""
+
+
+def _summarize_statistics(rows: Iterable[Dict[str, Any]], current_date: str) -> Dict[str, Any]:
+    """Tally statistics rows (one per permit) into the statistics dict"""
+    total_count = 0
+    expired_count = 0
+    by_type: Dict[str, int] = {}
+    by_organization: Dict[str, int] = {}
+    
+    for row in rows:
+        total_count += 1
+        
+        # Cosmos omits undefined fields from rows; null values come through
+        permit_type = row.get('permitType')
+        if permit_type is not None:
+            by_type[permit_type] = by_type.get(permit_type, 0) + 1
+        
+        organization = row.get('organization')
+        if organization is not None:
+            by_organization[organization] = by_organization.get(organization, 0) + 1
+        
+        expiration_date = row.get('expirationDate')
+        if permit_type == 'PLO' and isinstance(expiration_date, str) and expiration_date < current_date:
+            expired_count += 1
+    
+    return {
+        'total_permits': total_count,
+        'expired_count': expired_count,
+        'active_count': total_count - expired_count,
+        'by_type': by_type,
+        'by_organization': by_organization,
+        'generated_at': datetime.now().isoformat()
+    }
 
 
 def get_permit_statistics(
@@ -487,6 +1059,12 @@ def get_permit_statistics(
 ) -> Dict[str, Any]:
     """
     Get overall statistics of permits in the database
+    Results are cached per container for AGGREGATE_CACHE_TTL seconds
+    
+    All counts, including the by_type and by_organization breakdowns,
+    count individual permits, and are tallied from a single cross-partition
+    query. Permits whose document has no (or a null) permitType or
+    organization are left out of the respective breakdown.
     
     Args:
         container: CosmosDB container (auto-initialized if None)
@@ -500,89 +1078,78 @@ def get_permit_statistics(
         >>> print(f"Expired: {stats['expired_count']}")
     """
     # Auto-initialize container if not provided
-    if container is None:
-        container = get_permit_container()
+    container = container or _get_container()
     
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    with _aggregate_cache_lock:
+        cached = _statistics_cache.get(container.id)
+    if cached is not None:
+        return cached
     
-    # Count total permits
-    total_query = """
-        SELECT VALUE COUNT(1)
-        FROM c
-        JOIN p IN c.permits
-    """
+    try:
+        results = container.query_items(
+            query=_STATISTICS_QUERY,
+            enable_cross_partition_query=True,
+            max_item_count=NON_SELECTIVE_PAGE_SIZE
+        )
+        
+        statistics = _summarize_statistics(results, _iso_date())
+        
+        with _aggregate_cache_lock:
+            _statistics_cache[container.id] = statistics
+        
+        logger.info(f"Generated permit statistics: {statistics['total_permits']} total permits")
+        return statistics
     
-    # Count expired permits
-    expired_query = """
-        SELECT VALUE COUNT(1)
-        FROM c
-        JOIN p IN c.permits
-        WHERE p.expirationDate < @currentDate AND c.permitType = 'PLO'
+    except Exception as e:
+        logger.error(f"Error getting permit statistics: {e}")
+        raise
+
+
+async def get_permit_statistics_async(
+    container: Optional[AsyncContainerProxy] = None
+) -> Dict[str, Any]:
     """
+    Async variant of get_permit_statistics for use from the event loop
     
-    # Count by type
-    type_query = """
-        SELECT c.permitType, COUNT(1) as count
-        FROM c
-        GROUP BY c.permitType
-    """
+    Runs the same statistics query through azure.cosmos.aio, so the request
+    doesn't block a worker thread, and shares the statistics cache with the
+    sync version.
     
-    # Count by organization
-    org_query = """
-        SELECT c.organization, COUNT(1) as count
-        FROM c
-        GROUP BY c.organization
+    Args:
+        container: Async CosmosDB container (shared client used if None)
+        
+    Returns:
+        Dictionary containing statistics
+        
+    Example:
+        >>> stats, expiring = await asyncio.gather(
+        ...     get_permit_statistics_async(),
+        ...     asyncio.to_thread(query_documents_expiring_soon, days=30)
+        ... )
     """
+    container = container or get_permit_container_async()
+    
+    with _aggregate_cache_lock:
+        cached = _statistics_cache.get(container.id)
+    if cached is not None:
+        return cached
     
     try:
-        # Get total count
-        total_results = container.query_items(
-            query=total_query,
-            enable_cross_partition_query=True
-        )
-        total_count = next(total_results, 0)
+        rows = [
+            row async for row in container.query_items(
+                query=_STATISTICS_QUERY,
+                max_item_count=NON_SELECTIVE_PAGE_SIZE
+            )
+        ]
         
-        # Get expired count
-        expired_results = container.query_items(
-            query=expired_query,
-            parameters=[dict(name="@currentDate", value=current_date)],
-            enable_cross_partition_query=True
-        )
-        expired_count = next(expired_results, 0)
+        statistics = _summarize_statistics(rows, _iso_date())
         
-        # Get counts by type
-        type_results = container.query_items(
-            query=type_query,
-            enable_cross_partition_query=True
-        )
-        by_type = {item['permitType']: item['count'] for item in type_results}
+        with _aggregate_cache_lock:
+            _statistics_cache[container.id] = statistics
         
-        # Get counts by organization
-        org_results = container.query_items(
-            query=org_query,
-            enable_cross_partition_query=True
-        )
-        by_organization = {item['organization']: item['count'] for item in org_results}
-        
-        statistics = {
-            'total_permits': total_count,
-            'expired_count': expired_count,
-            'active_count': total_count - expired_count,
-            'by_type': by_type,
-            'by_organization': by_organization,
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        logger.info(f"Generated permit statistics: {total_count} total permits")
+        logger.info(f"Generated permit statistics: {statistics['total_permits']} total permits")
         return statistics
     
     except Exception as e:
         logger.error(f"Error getting permit statistics: {e}")
-        return {
-            'total_permits': 0,
-            'expired_count': 0,
-            'active_count': 0,
-            'by_type': {},
-            'by_organization': {},
-            'error': str(e)
-        }
\ No newline at end of file
+        raise
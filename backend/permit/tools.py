@@ -3,14 +3,22 @@ LangChain tools for permit agent
 Provides tools for document search, temporal queries, and permit metadata retrieval
 """
 import os
+import re
+import asyncio
+import inspect
 import logging
-from datetime import datetime
-from typing import Literal, Optional, List
-from langchain_core.tools import tool, Tool
-from openai import OpenAI
+import threading
+from datetime import date
+from functools import lru_cache, wraps
+from io import StringIO
+from typing import Callable, Dict, Literal, Optional, List, Tuple
+import httpx
+from cachetools import TTLCache
+from langchain_core.tools import tool, StructuredTool, Tool
+from openai import AzureOpenAI
 
 # Import dari backend.client
-from backend.client import AzureAISearch, get_permit_container
+from backend.client import AzureAISearch, SemanticCache, normalize_query
 
 from .queries import (
     query_documents_by_issue_year,
@@ -18,26 +26,245 @@ from .queries import (
     query_expired_documents,
     query_documents_expiring_soon,
     query_permit_by_number,
-    query_permits_by_installation
+    query_permits_by_installation,
+    invalidate_all
 )
 
 logger = logging.getLogger(__name__)
 
-# Initialize clients using classes from backend.client
-retrieval_client = AzureAISearch(
-    base_url=os.getenv("AZURE_AI_SEARCH_ENDPOINT"),
-    api_key=os.getenv("AZURE_AI_SEARCH_API_KEY"),
-    index_name=os.getenv("AZURE_AI_SEARCH_INDEX_NAME")
-)
+# Formatted tool results keyed by tool name, arguments and today's date, so
+# date-relative answers (expired, expiring soon) roll over at midnight
+TOOL_CACHE_TTL = 300
+_tool_cache: TTLCache = TTLCache(maxsize=512, ttl=TOOL_CACHE_TTL)
+# Lookups that matched nothing (often hallucinated permit numbers), kept
+# apart so they can't evict real results and expire sooner once data lands
+NEGATIVE_CACHE_TTL = 60
+_negative_cache: TTLCache = TTLCache(maxsize=2048, ttl=NEGATIVE_CACHE_TTL)
+_tool_cache_lock = threading.Lock()
+# Minimum keyword embedding similarity for reusing a cached document search
+SEMANTIC_CACHE_THRESHOLD = 0.95
+# Searches currently running, keyed like the document cache (day, normalized keyword)
+_inflight_searches: Dict[Tuple[str, str], "asyncio.Task[str]"] = {}
+
+# Document search sizes: ranked captions first, full content as a fallback
+CAPTION_SEARCH_K = 5
+CONTENT_SEARCH_K = 10
+# Hits the semantic ranker scores below this (on its 0-4 scale) are dropped
+MIN_RERANKER_SCORE = 1.5
 
-cosmos_container = get_permit_container()
+# Keywords with fewer word characters than this, or made up only of
+# stopwords (English and Indonesian), are answered without searching
+MIN_KEYWORD_CHARS = 3
+_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'about', 'for', 'in', 'is', 'of', 'on',
+    'or', 'the', 'this', 'that', 'to', 'what', 'which', 'with',
+    'ada', 'apa', 'dan', 'dari', 'di', 'dengan', 'ini', 'itu', 'ke',
+    'untuk', 'yang',
+})
+_NO_DOCUMENTS = "No relevant documents found for the query."
 
-# Initialize OpenAI client for embeddings (if needed)
-openai_client = OpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    base_url=f"{os.getenv('AZURE_OPENAI_ENDPOINT')}/openai/deployments/{os.getenv('AZURE_OPENAI_EMBEDDING_NAME')}",
-    default_headers={"api-key": os.getenv("AZURE_OPENAI_API_KEY")}
+# Rows per Cosmos page when a tool streams its results
+STREAM_PAGE_SIZE = 100
+
+# Per-item layouts of the list tools, filled with _format_item
+_ITEM_DEFAULTS = {
+    'documentTitle': 'N/A',
+    'permitNumber': 'N/A',
+    'permitType': 'N/A',
+    'organization': 'N/A',
+    'installation': 'N/A',
+    'issueDate': 'N/A',
+    'expirationDate': 'N/A',
+    'permitSummary': 'No summary available',
+}
+_ISSUED_ITEM_TMPL = (
+    "{idx}. {documentTitle} - {permitNumber}\n"
+    "   Organization: {organization}\n"
+    "   Issue Date: {issueDate}\n"
+    "   Summary: {permitSummary}\n"
+)
+_EXPIRATION_ITEM_TMPL = (
+    "{idx}. {documentTitle} - {permitNumber}\n"
+    "   Organization: {organization}\n"
+    "   Expiration Date: {expirationDate}\n"
+    "   Summary: {permitSummary}\n"
 )
+_EXPIRED_ITEM_TMPL = (
+    "{idx}. {documentTitle} - {permitNumber}\n"
+    "   Organization: {organization}\n"
+    "   Installation: {installation}\n"
+    "   Expired On: {expirationDate}\n"
+    "   Summary: {permitSummary}\n"
+)
+_EXPIRING_SOON_ITEM_TMPL = (
+    "{idx}. {documentTitle} - {permitNumber}\n"
+    "   Organization: {organization}\n"
+    "   Installation: {installation}\n"
+    "   Expires On: {expiry}\n"
+    "   Summary: {permitSummary}\n"
+)
+_INSTALLATION_ITEM_TMPL = (
+    "{idx}. {permitNumber} - {permitType}\n"
+    "   Document: {documentTitle}\n"
+    "   Organization: {organization}\n"
+    "   Issue Date: {issueDate}\n"
+    "   Expiration: {expirationDate}\n"
+    "   Summary: {permitSummary}\n"
+)
+
+# Clients are created on first use, so importing the tools (or a worker
+# that never calls them) doesn't pay for client construction; env vars are
+# read at that point rather than at import. The search client gets no
+# response cache of its own: the document tool caches its formatted results
+# in _document_cache
+@lru_cache(maxsize=1)
+def _search() -> AzureAISearch:
+    return AzureAISearch(
+        base_url=os.getenv("AZURE_AI_SEARCH_ENDPOINT"),
+        api_key=os.getenv("AZURE_AI_SEARCH_API_KEY"),
+        index_name=os.getenv("AZURE_AI_SEARCH_INDEX_NAME")
+    )
+
+
+# Azure OpenAI client for embeddings (if needed), on the same API version as
+# the chat client. Embeddings run in worker threads, so it gets a pooled
+# sync HTTP/2 client: concurrent embedding calls multiplex over one
+# kept-alive connection instead of new handshakes
+@lru_cache(maxsize=1)
+def _openai() -> AzureOpenAI:
+    return AzureOpenAI(
+        api_version=os.getenv("AZURE_OPENAI_PREVIEW_API_VERSION", "2024-05-01-preview"),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        azure_deployment=os.getenv("AZURE_OPENAI_EMBEDDING_NAME"),
+        http_client=httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=90.0)
+        )
+    )
+
+
+async def close_clients() -> None:
+    """Close the search and OpenAI clients' connection pools, if they were created"""
+    if _search.cache_info().currsize:
+        await _search().close()
+        _search.cache_clear()
+    if _openai.cache_info().currsize:
+        _openai().close()
+        _openai.cache_clear()
+
+
+def _embed_keyword(text: str) -> List[float]:
+    response = _openai().embeddings.create(
+        model=os.getenv("AZURE_OPENAI_EMBEDDING_NAME"),
+        input=text
+    )
+    return response.data[0].embedding
+
+
+# Document search results keyed by today's date and keyword. With an
+# embedding deployment configured, paraphrased keywords also hit when their
+# embeddings are close enough; otherwise only normalized text matches
+@lru_cache(maxsize=1)
+def _document_cache() -> SemanticCache:
+    embed = _embed_keyword if os.getenv("AZURE_OPENAI_EMBEDDING_NAME") else None
+    return SemanticCache(
+        maxsize=512,
+        ttl=TOOL_CACHE_TTL,
+        threshold=SEMANTIC_CACHE_THRESHOLD,
+        embed=embed
+    )
+
+
+def clear_permit_tool_cache() -> None:
+    """
+    Drop cached tool results along with the underlying query caches
+    Call after permit metadata or the search index changes
+    """
+    with _tool_cache_lock:
+        _tool_cache.clear()
+        _negative_cache.clear()
+    _document_cache().clear()
+    invalidate_all()
+
+
+class _NotFound(str):
+    """Tool result reporting that nothing matched; cached in _negative_cache"""
+
+
+def _format_item(template: str, idx: int, item: Dict, **extra) -> str:
+    """Render one list entry, falling back to _ITEM_DEFAULTS for missing fields"""
+    fields = dict(_ITEM_DEFAULTS)
+    fields.update(item)
+    fields.update(extra)
+    fields['idx'] = idx
+    return template.format_map(fields)
+
+
+def _expiry_text(item: Dict, today: date) -> str:
+    """Expiration date followed by the days remaining, if the date is known"""
+    expiry = item.get('expirationDate', 'N/A')
+    if expiry == 'N/A':
+        return f"{expiry} "
+    # Normally projected by the query; only parse the date when it's missing
+    days_remaining = item.get('daysRemaining')
+    if days_remaining is None:
+        days_remaining = (date.fromisoformat(expiry) - today).days
+    return f"{expiry} ({days_remaining} days remaining)"
+
+
+def _cached_tool(func: Callable[..., str]) -> Callable[..., str]:
+    """
+    Serve repeated tool calls with identical arguments from the tool cache
+    
+    Apply below @tool; the wrapper keeps the signature and docstring that
+    LangChain builds the tool schema from. Error messages are not cached,
+    and _NotFound results go to the shorter-lived negative cache.
+    """
+    signature = inspect.signature(func)
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, tuple(sorted(bound.arguments.items())), date.today().isoformat())
+        
+        with _tool_cache_lock:
+            cached = _tool_cache.get(key)
+            if cached is None:
+                cached = _negative_cache.get(key)
+        if cached is not None:
+            logger.info(f"Tool cache hit: {func.__name__}")
+            return cached
+        
+        result = func(*args, **kwargs)
+        if isinstance(result, _NotFound):
+            with _tool_cache_lock:
+                _negative_cache[key] = result
+        elif not result.startswith("Error "):
+            with _tool_cache_lock:
+                _tool_cache[key] = result
+        return result
+    
+    return wrapper
+
+
+def _awaitable(cosmos_tool: StructuredTool) -> StructuredTool:
+    """
+    Give a sync Cosmos-backed tool a coroutine that runs it in a worker thread
+    
+    Apply above @tool. Agents that call several tools in one turn await
+    them together, so their Cosmos round-trips overlap instead of running
+    back to back on the event loop thread.
+    """
+    func = cosmos_tool.func
+    
+    async def coroutine(*args, **kwargs) -> str:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    cosmos_tool.coroutine = coroutine
+    return cosmos_tool
 
 
 async def get_permit_document_content(keyword: str) -> str:
@@ -59,23 +286,101 @@ async def get_permit_document_content(keyword: str) -> str:
         >>> print(content)
         # Returns: "Document1.pdf: Content about submarine pipeline..."
     """
+    if _is_junk_keyword(keyword):
+        logger.info(f"Skipping search for junk keyword: {keyword!r}")
+        return _NO_DOCUMENTS
+    
+    day = date.today().isoformat()
+    cached = await _document_cache().aget(day, keyword)
+    if cached is not None:
+        logger.info(f"Search cache hit for keyword: {keyword}")
+        return cached
+    
+    # Concurrent calls for the same keyword share one search, keyed like the
+    # document cache. No lock is needed: nothing awaits between the lookup
+    # and the registration. The search runs in its own task and every caller
+    # awaits it through shield(), so a caller being cancelled (e.g. an agent
+    # step timing out) doesn't cancel the search for the others
+    cache_key = (day, normalize_query(keyword))
+    search = _inflight_searches.get(cache_key)
+    if search is None:
+        search = asyncio.ensure_future(_search_permit_documents(keyword, day))
+        _inflight_searches[cache_key] = search
+        search.add_done_callback(lambda _: _inflight_searches.pop(cache_key, None))
+    else:
+        logger.info(f"Joining in-flight search for keyword: {keyword}")
+    return await asyncio.shield(search)
+
+
+def _is_junk_keyword(keyword: str) -> bool:
+    """Whether a keyword can't produce useful hits (too short, or only stopwords)"""
+    tokens = re.findall(r"\w+", keyword.lower())
+    return (
+        sum(len(token) for token in tokens) < MIN_KEYWORD_CHARS
+        or all(token in _STOPWORDS for token in tokens)
+    )
+
+
+def _relevant_hits(search_results: Dict) -> List[Dict]:
+    """Search hits, minus those the semantic ranker scored below MIN_RERANKER_SCORE"""
+    return [
+        doc for doc in search_results.get('value', [])
+        if doc.get('@search.rerankerScore', MIN_RERANKER_SCORE) >= MIN_RERANKER_SCORE
+    ]
+
+
+def _caption_text(doc: Dict) -> str:
+    """Join the semantic captions returned for a search hit"""
+    return " ".join(
+        caption.get('text', '') for caption in doc.get('@search.captions') or []
+    ).strip()
+
+
+async def _search_permit_documents(keyword: str, day: str) -> str:
+    """Run the document search behind get_permit_document_content"""
     try:
         logger.info(f"Searching documents with keyword: {keyword}")
         
-        search_results = await retrieval_client.semantic_ranking_search(
+        # Start with the top few ranked captions, which skips transferring
+        # full document content; widen to full content of the top 10 only
+        # when relevant hits produced no captions. Hits come back in
+        # descending reranker score, so if none of the top few pass
+        # MIN_RERANKER_SCORE, none of a wider search would either
+        search_results = await _search().semantic_ranking_search(
             keyword=keyword,
-            k=10,
-            select_fields=["title", "content"]
+            k=CAPTION_SEARCH_K,
+            select_fields=["title"],
+            captions="extractive|highlight-false"
         )
+        hits = _relevant_hits(search_results)
+        if not hits:
+            logger.warning(f"No relevant documents found for keyword: {keyword}")
+            return _NO_DOCUMENTS
+        
+        docs = [
+            (doc.get('title', 'Untitled'), _caption_text(doc))
+            for doc in hits
+        ]
+        docs = [(title, text) for title, text in docs if text]
+        
+        if not docs:
+            search_results = await _search().semantic_ranking_search(
+                keyword=keyword,
+                k=CONTENT_SEARCH_K,
+                select_fields=["title", "content"]
+            )
+            docs = [
+                (doc.get('title', 'Untitled'), doc.get('content', ''))
+                for doc in _relevant_hits(search_results)
+            ]
         
-        if not search_results.get('value'):
+        if not docs:
             logger.warning(f"No documents found for keyword: {keyword}")
-            return "No relevant documents found for the query."
+            return _NO_DOCUMENTS
         
-        docs = [doc.get('content', '') for doc in search_results['value']]
-        titles = [doc.get('title', 'Untitled') for doc in search_results['value']]
+        result = "\n\n".join(f"[{t}]:\n{d}" for t, d in docs)
         
-        result = "\n\n".join([f"[{t}]:\n{d}" for t, d in zip(titles, docs)])
+        await _document_cache().aset(day, keyword, result)
         
         logger.info(f"Found {len(docs)} documents for keyword: {keyword}")
         return result
@@ -85,6 +390,39 @@ async def get_permit_document_content(keyword: str) -> str:
         return f"Error retrieving documents: {str(e)}"
 
 
+async def get_permit_document_content_batch(keywords: List[str]) -> str:
+    """
+    Get relevant permit document content for several keywords at once.
+    Use this instead of repeated get_permit_document_content calls when a
+    question needs lookups on more than one topic.
+    
+    Duplicate keywords are searched once; the searches run concurrently
+    and share the caches of get_permit_document_content.
+    
+    Args:
+        keywords: Search queries
+        
+    Returns:
+        One section per distinct keyword, in the order given
+        
+    Example:
+        >>> content = await get_permit_document_content_batch(
+        ...     ["submarine pipeline IT Semarang", "KKPRL requirements"]
+        ... )
+    """
+    unique = list(dict.fromkeys(keywords))
+    if not unique:
+        return _NO_DOCUMENTS
+    
+    results = await asyncio.gather(
+        *(get_permit_document_content(keyword) for keyword in unique)
+    )
+    return "\n\n".join(
+        f"Results for '{keyword}':\n{result}"
+        for keyword, result in zip(unique, results)
+    )
+
+
 @tool
 def get_current_date() -> str:
     """
@@ -98,7 +436,7 @@ def get_current_date() -> str:
         >>> date = get_current_date()
         >>> print(date)  # "2025-11-20"
     """
-    current = datetime.now().strftime("%Y-%m-%d")
+    current = date.today().isoformat()
     logger.info(f"Current date requested: {current}")
     return current
 
@@ -121,10 +459,9 @@ def get_time_difference(now_datetime: str, target_datetime: str) -> int:
         >>> print(days)  # 46
     """
     try:
-        now = datetime.strptime(now_datetime, "%Y-%m-%d")
-        target = datetime.strptime(target_datetime, "%Y-%m-%d")
-        delta = target - now
-        days = delta.days
+        now = date.fromisoformat(now_datetime)
+        target = date.fromisoformat(target_datetime)
+        days = (target - now).days
         
         logger.info(f"Time difference calculated: {days} days between {now_datetime} and {target_datetime}")
         return days
@@ -134,13 +471,16 @@ def get_time_difference(now_datetime: str, target_datetime: str) -> int:
         return 0
 
 
+@_awaitable
 @tool
+@_cached_tool
 def get_list_documents_by_issue_year(
     permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
     year: Optional[int] = None,
     organization: Optional[str] = None,
     operator: Optional[Literal['equal', 'greater', 'less']] = None,
-    order_by: Optional[Literal['latest', 'earliest']] = 'latest'
+    order_by: Optional[Literal['latest', 'earliest']] = 'latest',
+    summary_only: bool = False
 ) -> str:
     """
     Get list of documents issued in a specific year or year range.
@@ -155,6 +495,8 @@ def get_list_documents_by_issue_year(
             - 'greater': Permits issued in or after the year
             - 'less': Permits issued in or before the year
         order_by: Sort order ('latest' for newest first, 'earliest' for oldest first)
+        summary_only: Return just the number of matching documents, for
+            "how many" questions that don't need the list
         
     Returns:
         Formatted string of matching documents with details
@@ -173,29 +515,36 @@ def get_list_documents_by_issue_year(
             f"org={organization}, operator={operator}, order={order_by}"
         )
         
+        if summary_only:
+            count = query_documents_by_issue_year(
+                permit_type=permit_type,
+                year=year,
+                organization=organization,
+                operator=operator,
+                count_only=True
+            )
+            if not count:
+                return f"No documents found issued in year {year} with the specified filters."
+            return f"List of documents issued: {count} items found"
+        
         items = query_documents_by_issue_year(
-            container=cosmos_container,
             permit_type=permit_type,
             year=year,
             organization=organization,
             operator=operator,
-            order_by=order_by
+            order_by=order_by,
+            include_summary=True
         )
         
         if not items:
             return f"No documents found issued in year {year} with the specified filters."
         
-        result_list = [f"List of documents issued: {len(items)} items found\n"]
-        
-        for idx, item in enumerate(items, 1):
-            result_list.append(
-                f"{idx}. {item.get('documentTitle', 'N/A')} - {item.get('permitNumber', 'N/A')}\n"
-                f"   Organization: {item.get('organization', 'N/A')}\n"
-                f"   Issue Date: {item.get('issueDate', 'N/A')}\n"
-                f"   Summary: {item.get('permitSummary', 'No summary available')}\n"
-            )
-        
-        result = "\n".join(result_list)
+        header = f"List of documents issued: {len(items)} items found\n"
+        body = "\n".join(
+            _format_item(_ISSUED_ITEM_TMPL, idx, item)
+            for idx, item in enumerate(items, 1)
+        )
+        result = f"{header}\n{body}"
         logger.info(f"Found {len(items)} documents by issue year")
         return result
     
@@ -204,13 +553,16 @@ def get_list_documents_by_issue_year(
         return f"Error retrieving documents: {str(e)}"
 
 
+@_awaitable
 @tool
+@_cached_tool
 def get_list_documents_by_expiration_year(
     permit_type: Optional[Literal['PLO']] = None,
     year: Optional[int] = None,
     organization: Optional[str] = None,
     operator: Optional[Literal['equal', 'greater', 'less']] = None,
-    order_by: Optional[Literal['latest', 'earliest']] = 'latest'
+    order_by: Optional[Literal['latest', 'earliest']] = 'latest',
+    summary_only: bool = False
 ) -> str:
     """
     Get list of documents expiring in a specific year or year range.
@@ -223,6 +575,8 @@ def get_list_documents_by_expiration_year(
         organization: Organization to filter by (PPN, PGN, KPI, SHU)
         operator: Comparison operator ('equal', 'greater', 'less')
         order_by: Sort order ('latest' or 'earliest')
+        summary_only: Return just the number of matching documents, for
+            "how many" questions that don't need the list
         
     Returns:
         Formatted string of matching documents with expiration details
@@ -241,29 +595,36 @@ def get_list_documents_by_expiration_year(
             f"org={organization}, operator={operator}, order={order_by}"
         )
         
+        if summary_only:
+            count = query_documents_by_expiration_year(
+                permit_type=permit_type,
+                year=year,
+                organization=organization,
+                operator=operator,
+                count_only=True
+            )
+            if not count:
+                return f"No documents found expiring in year {year} with the specified filters."
+            return f"List of documents expiring: {count} items found"
+        
         items = query_documents_by_expiration_year(
-            container=cosmos_container,
             permit_type=permit_type,
             year=year,
             organization=organization,
             operator=operator,
-            order_by=order_by
+            order_by=order_by,
+            include_summary=True
         )
         
         if not items:
             return f"No documents found expiring in year {year} with the specified filters."
         
-        result_list = [f"List of documents expiring: {len(items)} items found\n"]
-        
-        for idx, item in enumerate(items, 1):
-            result_list.append(
-                f"{idx}. {item.get('documentTitle', 'N/A')} - {item.get('permitNumber', 'N/A')}\n"
-                f"   Organization: {item.get('organization', 'N/A')}\n"
-                f"   Expiration Date: {item.get('expirationDate', 'N/A')}\n"
-                f"   Summary: {item.get('permitSummary', 'No summary available')}\n"
-            )
-        
-        result = "\n".join(result_list)
+        header = f"List of documents expiring: {len(items)} items found\n"
+        body = "\n".join(
+            _format_item(_EXPIRATION_ITEM_TMPL, idx, item)
+            for idx, item in enumerate(items, 1)
+        )
+        result = f"{header}\n{body}"
         logger.info(f"Found {len(items)} documents by expiration year")
         return result
     
@@ -272,10 +633,13 @@ def get_list_documents_by_expiration_year(
         return f"Error retrieving documents: {str(e)}"
 
 
+@_awaitable
 @tool
+@_cached_tool
 def get_list_documents_already_expired(
     organization: Optional[str] = None,
-    order_by: Optional[Literal['latest', 'earliest']] = 'latest'
+    order_by: Optional[Literal['latest', 'earliest']] = 'latest',
+    summary_only: bool = False
 ) -> str:
     """
     Get list of documents that have already expired (expiration date < today).
@@ -284,6 +648,8 @@ def get_list_documents_already_expired(
     Args:
         organization: Organization to filter by (optional)
         order_by: Sort order ('latest' or 'earliest')
+        summary_only: Return just the number of matching documents, for
+            "how many" questions that don't need the list
         
     Returns:
         Formatted string of expired documents with details
@@ -292,36 +658,39 @@ def get_list_documents_already_expired(
         >>> result = get_list_documents_already_expired(organization='KPI')
     """
     try:
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_date = date.today().isoformat()
         
         logger.info(
             f"Querying expired documents as of {current_date}: org={organization}, order={order_by}"
         )
         
+        if summary_only:
+            count = query_expired_documents(organization=organization, count_only=True)
+            if not count:
+                return f"No expired documents found as of {current_date}."
+            return (
+                f"Documents that have already expired as of {current_date}:\n"
+                f"Total: {count} expired permits"
+            )
+        
         items = query_expired_documents(
-            container=cosmos_container,
             organization=organization,
-            order_by=order_by
+            order_by=order_by,
+            include_summary=True
         )
         
         if not items:
             return f"No expired documents found as of {current_date}."
         
-        result_list = [
+        header = (
             f"Documents that have already expired as of {current_date}:\n"
             f"Total: {len(items)} expired permits\n"
-        ]
-        
-        for idx, item in enumerate(items, 1):
-            result_list.append(
-                f"{idx}. {item.get('documentTitle', 'N/A')} - {item.get('permitNumber', 'N/A')}\n"
-                f"   Organization: {item.get('organization', 'N/A')}\n"
-                f"   Installation: {item.get('installation', 'N/A')}\n"
-                f"   Expired On: {item.get('expirationDate', 'N/A')}\n"
-                f"   Summary: {item.get('permitSummary', 'No summary available')}\n"
-            )
-        
-        result = "\n".join(result_list)
+        )
+        body = "\n".join(
+            _format_item(_EXPIRED_ITEM_TMPL, idx, item)
+            for idx, item in enumerate(items, 1)
+        )
+        result = f"{header}\n{body}"
         logger.info(f"Found {len(items)} expired documents")
         return result
     
@@ -330,11 +699,14 @@ def get_list_documents_already_expired(
         return f"Error retrieving expired documents: {str(e)}"
 
 
+@_awaitable
 @tool
+@_cached_tool
 def get_list_documents_expiring_soon(
     days: int = 30,
     organization: Optional[str] = None,
-    order_by: Optional[Literal['latest', 'earliest']] = 'earliest'
+    order_by: Optional[Literal['latest', 'earliest']] = 'earliest',
+    summary_only: bool = False
 ) -> str:
     """
     Get list of documents that will expire within specified number of days.
@@ -344,6 +716,8 @@ def get_list_documents_expiring_soon(
         days: Number of days to look ahead (default 30)
         organization: Organization to filter by (optional)
         order_by: Sort order ('latest' or 'earliest')
+        summary_only: Return just the number of matching documents, for
+            "how many" questions that don't need the list
         
     Returns:
         Formatted string of documents expiring soon
@@ -352,44 +726,48 @@ def get_list_documents_expiring_soon(
         >>> result = get_list_documents_expiring_soon(days=60, organization='SHU')
     """
     try:
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        today = date.today()
+        current_date = today.isoformat()
         
         logger.info(
             f"Querying documents expiring within {days} days: org={organization}, order={order_by}"
         )
         
+        if summary_only:
+            count = query_documents_expiring_soon(
+                days=days,
+                organization=organization,
+                count_only=True
+            )
+            if not count:
+                return f"No documents expiring within the next {days} days."
+            return (
+                f"Documents expiring within the next {days} days (as of {current_date}):\n"
+                f"Total: {count} permits"
+            )
+        
         items = query_documents_expiring_soon(
-            container=cosmos_container,
             days=days,
             organization=organization,
-            order_by=order_by
+            order_by=order_by,
+            include_summary=True
         )
         
         if not items:
             return f"No documents expiring within the next {days} days."
         
-        result_list = [
+        header = (
             f"Documents expiring within the next {days} days (as of {current_date}):\n"
             f"Total: {len(items)} permits\n"
-        ]
-        
-        for idx, item in enumerate(items, 1):
-            expiry = item.get('expirationDate', 'N/A')
-            if expiry != 'N/A':
-                days_remaining = (datetime.strptime(expiry, "%Y-%m-%d") - datetime.now()).days
-                days_text = f"({days_remaining} days remaining)"
-            else:
-                days_text = ""
-            
-            result_list.append(
-                f"{idx}. {item.get('documentTitle', 'N/A')} - {item.get('permitNumber', 'N/A')}\n"
-                f"   Organization: {item.get('organization', 'N/A')}\n"
-                f"   Installation: {item.get('installation', 'N/A')}\n"
-                f"   Expires On: {expiry} {days_text}\n"
-                f"   Summary: {item.get('permitSummary', 'No summary available')}\n"
+        )
+        body = "\n".join(
+            _format_item(
+                _EXPIRING_SOON_ITEM_TMPL, idx, item,
+                expiry=_expiry_text(item, today)
             )
-        
-        result = "\n".join(result_list)
+            for idx, item in enumerate(items, 1)
+        )
+        result = f"{header}\n{body}"
         logger.info(f"Found {len(items)} documents expiring within {days} days")
         return result
     
@@ -398,14 +776,17 @@ def get_list_documents_expiring_soon(
         return f"Error retrieving documents expiring soon: {str(e)}"
 
 
+@_awaitable
 @tool
-def get_permit_details(permit_number: str) -> str:
+@_cached_tool
+def get_permit_details(permit_number: str, organization: Optional[str] = None) -> str:
     """
     Get detailed information about a specific permit by permit number.
     Use this when user asks about a specific permit number.
     
     Args:
         permit_number: The permit number to search for (e.g., 'PLO-2024-001')
+        organization: Organization owning the permit, if known (PPN, PGN, KPI, SHU)
         
     Returns:
         Detailed information about the permit
@@ -417,22 +798,20 @@ def get_permit_details(permit_number: str) -> str:
         logger.info(f"Querying permit details for: {permit_number}")
         
         permit = query_permit_by_number(
-            container=cosmos_container,
-            permit_number=permit_number
+            permit_number=permit_number,
+            organization=organization
         )
         
         if not permit:
-            return f"Permit '{permit_number}' not found in the database."
+            return _NotFound(f"Permit '{permit_number}' not found in the database.")
         
-        current_date = datetime.now()
         expiry = permit.get('expirationDate')
         
         status = "Active"
         days_info = ""
         
         if expiry:
-            expiry_date = datetime.strptime(expiry, "%Y-%m-%d")
-            days_diff = (expiry_date - current_date).days
+            days_diff = (date.fromisoformat(expiry) - date.today()).days
             
             if days_diff < 0:
                 status = "Expired"
@@ -469,10 +848,13 @@ Document Path: {permit.get('filepath', 'N/A')}
         return f"Error retrieving permit details: {str(e)}"
 
 
+@_awaitable
 @tool
+@_cached_tool
 def get_permits_by_installation(
     installation: str,
-    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None
+    permit_type: Optional[Literal['PLO', 'KKPR/KKPRL', 'Ijin Lingkungan']] = None,
+    summary_only: bool = False
 ) -> str:
     """
     Get list of permits for a specific installation location.
@@ -481,6 +863,8 @@ def get_permits_by_installation(
     Args:
         installation: Installation location name (e.g., 'IT Semarang', 'IT Jakarta')
         permit_type: Type of permit to filter (optional)
+        summary_only: Return just the number of matching permits, for
+            "how many" questions that don't need the list
         
     Returns:
         Formatted string of permits for the installation
@@ -491,32 +875,45 @@ def get_permits_by_installation(
     try:
         logger.info(f"Querying permits for installation: {installation}, type={permit_type}")
         
+        if summary_only:
+            count = query_permits_by_installation(
+                installation=installation,
+                permit_type=permit_type,
+                count_only=True
+            )
+            if not count:
+                return _NotFound(f"No permits found for installation '{installation}'.")
+            return (
+                f"Permits for installation '{installation}':\n"
+                f"Total: {count} permits found"
+            )
+        
         items = query_permits_by_installation(
-            container=cosmos_container,
             installation=installation,
-            permit_type=permit_type
+            permit_type=permit_type,
+            include_summary=True,
+            stream=True,
+            max_item_count=STREAM_PAGE_SIZE
         )
         
-        if not items:
-            return f"No permits found for installation '{installation}'."
+        # Format rows as pages arrive instead of materializing the result
+        # set first; only the count header has to wait for the last page
+        buf = StringIO()
+        count = 0
+        for count, item in enumerate(items, 1):
+            if count > 1:
+                buf.write("\n")
+            buf.write(_format_item(_INSTALLATION_ITEM_TMPL, count, item))
         
-        result_list = [
-            f"Permits for installation '{installation}':\n"
-            f"Total: {len(items)} permits found\n"
-        ]
+        if not count:
+            return _NotFound(f"No permits found for installation '{installation}'.")
         
-        for idx, item in enumerate(items, 1):
-            result_list.append(
-                f"{idx}. {item.get('permitNumber', 'N/A')} - {item.get('permitType', 'N/A')}\n"
-                f"   Document: {item.get('documentTitle', 'N/A')}\n"
-                f"   Organization: {item.get('organization', 'N/A')}\n"
-                f"   Issue Date: {item.get('issueDate', 'N/A')}\n"
-                f"   Expiration: {item.get('expirationDate', 'N/A')}\n"
-                f"   Summary: {item.get('permitSummary', 'No summary available')}\n"
-            )
-        
-        result = "\n".join(result_list)
-        logger.info(f"Found {len(items)} permits for installation: {installation}")
+        header = (
+            f"Permits for installation '{installation}':\n"
+            f"Total: {count} permits found\n"
+        )
+        result = f"{header}\n{buf.getvalue()}"
+        logger.info(f"Found {count} permits for installation: {installation}")
         return result
     
     except Exception as e:
@@ -524,6 +921,26 @@ def get_permits_by_installation(
         return f"Error retrieving permits for installation: {str(e)}"
 
 
+async def warmup() -> None:
+    """
+    Preload the tool caches and open client connections at process start
+    
+    Fills the tool cache with today's expired and expiring-soon lists and
+    opens the Cosmos and Azure AI Search connections, so the first user
+    doesn't pay for them. Failures are logged and otherwise ignored.
+    """
+    results = await asyncio.gather(
+        _search().warmup(),
+        get_list_documents_already_expired.ainvoke({}),
+        get_list_documents_expiring_soon.ainvoke({}),
+        return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    for failure in failures:
+        logger.warning(f"Permit tool warm-up step failed: {failure}")
+    logger.info(f"Warmed permit tools ({len(results) - len(failures)}/{len(results)} steps)")
+
+
 def get_permit_tools() -> List[Tool]:
     """
     Return all permit agent tools for LangChain agent.
@@ -541,6 +958,7 @@ def get_permit_tools() -> List[Tool]:
         7. get_list_documents_expiring_soon - Get permits expiring soon
         8. get_permit_details - Get specific permit details
         9. get_permits_by_installation - Get permits by installation
+        10. get_permit_document_content_batch - Search documents for several keywords
     """
     logger.info("Initializing permit agent tools")
     
@@ -552,7 +970,7 @@ def get_permit_tools() -> List[Tool]:
             This performs semantic search to find the most relevant permit documents.
             
             Input: Search query or keywords from the user's question
-            Returns: Top 10 relevant permit documents with titles and content
+            Returns: The most relevant permit passages with their document titles
             
             Example use cases:
             - "What is the pipeline length in IT Semarang permit?"
@@ -570,5 +988,16 @@ def get_permit_tools() -> List[Tool]:
         get_list_documents_already_expired,
         get_list_documents_expiring_soon,
         get_permit_details,
-        get_permits_by_installation
+        get_permits_by_installation,
+        StructuredTool.from_function(
+            coroutine=get_permit_document_content_batch,
+            name="get_permit_document_content_batch",
+            description="""Same as get_permit_document_content, for several searches at once.
+            Use this when answering the question needs document content on more than
+            one topic, instead of calling get_permit_document_content repeatedly.
+            
+            Input: List of search queries
+            Returns: The most relevant permit passages for each query, under a
+            "Results for '<query>':" heading"""
+        )
     ]
\ No newline at end of file
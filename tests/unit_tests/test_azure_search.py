@@ -0,0 +1,194 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+
+from backend.client import azure_search
+from backend.client.azure_search import AzureAISearch, quantize_binary, quantize_int8
+from backend.client.search_cache import SemanticCache
+
+
+def make_client(handler):
+    client = AzureAISearch(
+        base_url="https://search.example.com",
+        api_key="key",
+        index_name="permits"
+    )
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url,
+        headers=dict(client.headers),
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_default_select_read_once_by_concurrent_callers():
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0)
+        return httpx.Response(200, json={"fields": [
+            {"name": "id"},
+            {"name": "content"},
+            {"name": "contentVector", "dimensions": 1536},
+        ]})
+
+    client = make_client(handler)
+    selects = await asyncio.gather(*(client._get_default_select() for _ in range(5)))
+
+    assert selects == ["id,content"] * 5
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_default_select_retried_after_failure(monkeypatch):
+    responses = [
+        httpx.Response(503),
+        httpx.Response(200, json={"fields": [{"name": "id"}]}),
+    ]
+    client = make_client(lambda request: responses.pop(0))
+    now = [1000.0]
+    monkeypatch.setattr(azure_search, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    assert await client._get_default_select() is None
+    assert await client._get_default_select() is None
+    assert len(responses) == 1
+
+    now[0] += azure_search.DEFAULT_SELECT_RETRY_AFTER
+    assert await client._get_default_select() == "id"
+    assert client._default_select_loaded
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    delays = []
+
+    def retry_delay(headers, attempt):
+        delays.append((dict(headers).get("retry-after-ms"), attempt))
+        return 0
+
+    monkeypatch.setattr(AzureAISearch, "_retry_delay", staticmethod(retry_delay))
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_throttled_search_is_retried(no_backoff):
+    responses = [
+        httpx.Response(429, headers={"retry-after-ms": "250"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"value": [{"id": "1"}]}),
+    ]
+    client = make_client(lambda request: responses.pop(0))
+
+    result = await client.vector_search([0.1, 0.2], select_fields=["id"])
+
+    assert result == {"value": [{"id": "1"}]}
+    assert no_backoff == [("250", 0), (None, 1)]
+
+
+@pytest.mark.asyncio
+async def test_throttled_search_gives_up_after_max_retries(no_backoff):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(429)
+
+    client = make_client(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.vector_search([0.1, 0.2], select_fields=["id"])
+
+    assert len(requests) == azure_search.MAX_SEARCH_RETRIES + 1
+    assert len(no_backoff) == azure_search.MAX_SEARCH_RETRIES
+
+
+@pytest.mark.parametrize("headers, attempt, expected", [
+    ({"retry-after-ms": "1500"}, 0, 1.5),
+    ({"Retry-After": "3"}, 0, 3.0),
+    ({}, 2, 4.0),
+    ({"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}, 1, 2.0),
+])
+def test_retry_delay_honors_headers_with_jitter(headers, attempt, expected):
+    delay = AzureAISearch._retry_delay(headers, attempt)
+
+    assert expected <= delay <= expected + 0.2
+
+
+def test_quantize_int8_scales_peak_to_127():
+    assert quantize_int8([0.5, -1.0, 0.25]) == [64, -127, 32]
+    assert quantize_int8([0.0, 0.0]) == [0, 0]
+
+
+def test_quantize_binary_packs_sign_bits_msb_first():
+    assert quantize_binary([1, -1, 0.5, 0, 0, 0, 0, 1, 0.3]) == [0b10100001, 0b10000000]
+
+
+@pytest.mark.asyncio
+async def test_quantized_vector_search_uses_newer_api_version():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"value": []})
+
+    client = make_client(handler)
+    await client.vector_search([0.5, -1.0], select_fields=["id"], quantization="int8")
+
+    (request,) = requests
+    assert request.url.params["api-version"] == azure_search.QUANTIZED_SEARCH_API_VERSION
+    assert orjson.loads(request.content)["vectorQueries"][0]["vector"] == [64, -127]
+
+
+@pytest.mark.asyncio
+async def test_responses_only_cached_when_a_cache_is_given():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"value": [{"id": str(len(requests))}]})
+
+    client = make_client(handler)
+    assert client.cache is None
+    for _ in range(2):
+        await client.semantic_ranking_search("pipeline", select_fields=["id"])
+    assert len(requests) == 2
+
+    client.cache = SemanticCache()
+    for _ in range(2):
+        await client.semantic_ranking_search("pipeline", select_fields=["id"])
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_close_resets_clients_so_they_reopen():
+    client = AzureAISearch(base_url="https://search.example.com", api_key="key", index_name="permits")
+    first = client._get_client()
+    await client.close()
+
+    assert first.is_closed
+    assert client._client is None and client._session is None
+
+    second = client._get_client()
+    assert second is not first and not second.is_closed
+    assert second.headers["api-key"] == "key"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_warmup_opens_connection_without_reading_schema():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(403)
+
+    client = make_client(handler)
+    await client.warmup()
+
+    (request,) = requests
+    assert request.url.path == "/indexes/permits/docs/$count"
+    assert not client._default_select_loaded
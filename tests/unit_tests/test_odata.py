@@ -0,0 +1,35 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from backend.client.odata import ODataFilter, format_literal
+
+
+def test_format_literal_escapes_quotes():
+    assert format_literal("O'Brien") == "'O''Brien'"
+    assert format_literal(True) == "true"
+    assert format_literal(2024) == "2024"
+    assert format_literal(None) == "null"
+
+
+def test_odata_filter_render():
+    flt = ODataFilter.eq("permitType", "PLO") & ~ODataFilter.lt("year", 2020)
+    assert flt.render() == "(permitType eq 'PLO') and (not (year lt 2020))"
+    assert str(flt) == flt.render()
+
+
+def test_odata_filter_in():
+    flt = ODataFilter.in_("organization", ["PPN", "PGN"])
+    assert flt.render() == "search.in(organization, 'PPN|PGN', '|')"
+
+
+def test_odata_filter_rejects_invalid_field():
+    with pytest.raises(ValueError):
+        ODataFilter.eq("permitType eq 'x' or true", "PLO")
+
+
+def test_format_literal_renders_datetimes_in_utc():
+    assert format_literal(date(2024, 1, 1)) == "2024-01-01T00:00:00Z"
+    assert format_literal(datetime(2024, 1, 1)) == "2024-01-01T00:00:00Z"
+    assert format_literal(
+        datetime(2024, 1, 1, 7, 30, tzinfo=timezone(timedelta(hours=7)))
+    ) == "2024-01-01T00:30:00Z"
@@ -0,0 +1,227 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from cachetools import TTLCache
+
+from backend.permit import queries
+
+
+class FakeContainer:
+    def __init__(self, rows=None, partition_key=None, id="permits"):
+        self.id = id
+        self.rows = rows or []
+        self.partition_key = partition_key
+        self.queries = []
+
+    def read(self):
+        if self.partition_key is None:
+            raise RuntimeError("forbidden")
+        return {"id": self.id, "partitionKey": {"paths": self.partition_key, "kind": "Hash"}}
+
+    def query_items(self, query, parameters=None, **kwargs):
+        self.queries.append((query, parameters, kwargs))
+        return iter(list(self.rows))
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    queries.invalidate_all()
+    queries._partition_key_paths.clear()
+    yield
+    queries.invalidate_all()
+    queries._partition_key_paths.clear()
+
+
+def test_permit_lookup_scoped_when_partitioned_by_organization():
+    container = FakeContainer(partition_key=["/organization"], id="by-org")
+    queries.query_permit_by_number(container, "PLO-2020-001", organization="PPN")
+
+    ((query, _, kwargs),) = container.queries
+    assert "TOP 1" in query
+    assert kwargs == {"partition_key": "PPN"}
+
+
+@pytest.mark.parametrize("partition_key", [["/id"], None])
+def test_permit_lookup_fans_out_on_other_partition_keys(partition_key):
+    container = FakeContainer(partition_key=partition_key, id=f"other-{partition_key}")
+    queries.query_permit_by_number(container, "PLO-2020-001", organization="PPN")
+
+    ((query, parameters, kwargs),) = container.queries
+    assert "TOP 1" not in query
+    assert "c.organization = @organization" in query
+    assert {"name": "@organization", "value": "PPN"} in parameters
+    assert kwargs == {"enable_cross_partition_query": True}
+
+
+def test_permit_statistics_tallied_from_one_query(monkeypatch):
+    monkeypatch.setattr(queries, "_iso_date", lambda days=0: "2026-01-01")
+    container = FakeContainer(id="stats", rows=[
+        {"permitType": "PLO", "organization": "PPN", "expirationDate": "2025-06-01"},
+        {"permitType": "PLO", "organization": "PPN", "expirationDate": "2027-06-01"},
+        {"permitType": "PLO", "organization": "PGN"},
+        {"permitType": "KKPR/KKPRL", "organization": "PGN", "expirationDate": "2020-01-01"},
+        {"permitType": None, "organization": None, "expirationDate": "2020-01-01"},
+        {},
+    ])
+    statistics = queries.get_permit_statistics(container)
+
+    assert statistics["total_permits"] == 6
+    assert statistics["expired_count"] == 1
+    assert statistics["active_count"] == 5
+    assert statistics["by_type"] == {"PLO": 3, "KKPR/KKPRL": 1}
+    assert statistics["by_organization"] == {"PPN": 2, "PGN": 2}
+    ((query, _, kwargs),) = container.queries
+    assert "GROUP BY" not in query
+    assert kwargs["enable_cross_partition_query"] is True
+
+
+def test_permit_statistics_errors_are_raised_not_cached():
+    class FailingContainer(FakeContainer):
+        def query_items(self, query, parameters=None, **kwargs):
+            raise RuntimeError("throttled")
+
+    container = FailingContainer(id="failing")
+    with pytest.raises(RuntimeError):
+        queries.get_permit_statistics(container)
+    assert "failing" not in queries._statistics_cache
+
+
+def test_failed_partition_key_read_is_retried_after_a_while(monkeypatch):
+    reads = []
+    container = FakeContainer(id="no-metadata")
+    read = container.read
+
+    def counting_read():
+        reads.append(1)
+        return read()
+
+    container.read = counting_read
+    now = [1000.0]
+    monkeypatch.setattr(queries, "time", SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+
+    for _ in range(3):
+        queries.query_permit_by_number(container, "PLO-2020-001", organization="PPN")
+    assert len(reads) == 1
+
+    container.partition_key = ["/organization"]
+    now[0] += queries.PARTITION_KEY_RETRY_AFTER
+    queries.query_permit_by_number(container, "PLO-2020-001", organization="PPN")
+    assert len(reads) == 2
+    assert container.queries[-1][2] == {"partition_key": "PPN"}
+
+
+def normalize_sql(query):
+    return " ".join(query.split())
+
+
+@pytest.mark.parametrize("call, expected", [
+    (
+        lambda container: queries.query_documents_by_issue_year(
+            container, permit_type="PLO", year=2024, operator="equal", count_only=True
+        ),
+        "SELECT VALUE COUNT(1) FROM c JOIN p IN c.permits WHERE c.permitType = @permitType"
+        " AND p.issueDate >= @yearStart AND p.issueDate < @yearEnd",
+    ),
+    (
+        lambda container: queries.query_expired_documents(
+            container, organization="PPN", count_only=True
+        ),
+        "SELECT VALUE COUNT(1) FROM c JOIN p in c.permits WHERE p.expirationDate < @currentDate"
+        " AND c.permitType = 'PLO' AND c.organization = @organization",
+    ),
+    (
+        lambda container: queries.query_documents_expiring_soon(container, days=30, count_only=True),
+        "SELECT VALUE COUNT(1) FROM c JOIN p in c.permits WHERE p.expirationDate >= @currentDate"
+        " AND p.expirationDate <= @futureDate AND c.permitType = 'PLO'",
+    ),
+    (
+        lambda container: queries.query_permits_by_installation(
+            container, installation="IT Semarang", permit_type="PLO", count_only=True
+        ),
+        "SELECT VALUE COUNT(1) FROM c JOIN p in c.permits"
+        " WHERE CONTAINS(p.installation, @installation, true) AND c.permitType = @permitType",
+    ),
+])
+def test_count_only_projects_value_count_over_the_list_clause(call, expected):
+    container = FakeContainer(rows=[4, 3])
+
+    assert call(container) == 7
+    ((query, _, kwargs),) = container.queries
+    assert normalize_sql(query) == expected
+    assert kwargs == {"enable_cross_partition_query": True}
+
+
+@pytest.mark.parametrize("operator, conditions, parameters", [
+    ("equal", ["p.issueDate >= @yearStart", "p.issueDate < @yearEnd"],
+     {"@yearStart": "2024-01-01", "@yearEnd": "2025-01-01"}),
+    ("greater", ["p.issueDate >= @yearStart"], {"@yearStart": "2024-01-01"}),
+    ("less", ["p.issueDate < @yearEnd"], {"@yearEnd": "2025-01-01"}),
+])
+def test_year_filters_are_string_range_predicates(operator, conditions, parameters):
+    container = FakeContainer()
+    queries.query_documents_by_issue_year(container, year=2024, operator=operator)
+
+    ((query, sent, _),) = container.queries
+    where = normalize_sql(query).split(" WHERE ", 1)[1]
+    assert where.split(" AND ") == conditions
+    assert "YEAR(" not in query
+    assert {p["name"]: p["value"] for p in sent} == parameters
+
+
+def test_year_filter_needs_both_year_and_operator():
+    container = FakeContainer()
+    queries.query_documents_by_expiration_year(container, year=2024)
+
+    ((query, parameters, _),) = container.queries
+    assert "WHERE" not in query
+    assert parameters == []
+
+
+@pytest.fixture
+def default_container(monkeypatch):
+    container = FakeContainer()
+    now = [0.0]
+    monkeypatch.setattr(queries, "_get_container", lambda: container)
+    monkeypatch.setattr(queries, "_query_cache", TTLCache(
+        maxsize=16, ttl=queries.QUERY_CACHE_TTL, timer=lambda: now[0]
+    ))
+    container.now = now
+    return container
+
+
+def test_cached_query_serves_repeats_until_ttl(default_container):
+    default_container.rows = [{"permitNumber": "PLO-2020-001", "expirationDate": "2021-01-01"}]
+
+    first = queries.query_expired_documents(organization="PPN")
+    assert queries.query_expired_documents(organization="PPN") is first
+    assert len(default_container.queries) == 1
+
+    queries.query_expired_documents(organization="PGN")
+    assert len(default_container.queries) == 2
+
+    default_container.now[0] += queries.QUERY_CACHE_TTL
+    queries.query_expired_documents(organization="PPN")
+    assert len(default_container.queries) == 3
+
+
+def test_cached_query_bypassed_for_explicit_container(default_container):
+    other = FakeContainer(rows=[{"permitNumber": "PLO-2020-001", "expirationDate": "2021-01-01"}])
+    queries.query_expired_documents(other)
+    queries.query_expired_documents(other)
+
+    assert len(other.queries) == 2
+    assert len(queries._query_cache) == 0
+
+
+def test_cached_query_skips_errors_and_empty_results(default_container):
+    def fail(query, parameters=None, **kwargs):
+        raise RuntimeError("throttled")
+
+    default_container.query_items = fail
+    with pytest.raises(RuntimeError):
+        queries.query_expired_documents()
+    del default_container.query_items
+
+    assert queries.query_expired_documents() == []
+    assert len(queries._query_cache) == 0
@@ -0,0 +1,248 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from cachetools import TTLCache
+
+pytest.importorskip("langchain_core")
+
+from backend.permit import queries, tools
+
+
+class FakeContainer:
+    id = "permits"
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.error = None
+        self.queries = []
+
+    def query_items(self, query, parameters=None, **kwargs):
+        self.queries.append((query, parameters, kwargs))
+        if self.error is not None:
+            raise self.error
+        return iter(list(self.rows))
+
+
+EXPIRED_PERMIT = {
+    "documentTitle": "PLO Pipeline",
+    "permitNumber": "PLO-2020-001",
+    "organization": "PPN",
+    "installation": "IT Semarang",
+    "expirationDate": "2021-01-01",
+}
+
+
+@pytest.fixture
+def container(monkeypatch):
+    container = FakeContainer()
+    monkeypatch.setattr(queries, "_get_container", lambda: container)
+    tools.clear_permit_tool_cache()
+    yield container
+    tools.clear_permit_tool_cache()
+
+
+def test_failed_query_is_not_cached(container):
+    container.error = CosmosHttpResponseError(status_code=429, message="throttled")
+    assert tools.get_list_documents_already_expired.invoke({}).startswith("Error ")
+
+    container.error = None
+    container.rows = [EXPIRED_PERMIT]
+    result = tools.get_list_documents_already_expired.invoke({})
+
+    assert "PLO-2020-001" in result
+    assert len(container.queries) == 2
+
+
+def test_failed_lookup_is_not_negative_cached(container):
+    container.error = CosmosHttpResponseError(status_code=503, message="unavailable")
+    assert tools.get_permit_details.invoke({"permit_number": "PLO-2020-001"}).startswith("Error ")
+    assert tools.get_permits_by_installation.invoke({"installation": "IT Semarang"}).startswith("Error ")
+    assert len(tools._negative_cache) == 0
+
+    container.error = None
+    container.rows = [EXPIRED_PERMIT]
+    assert "Permit Details for PLO-2020-001" in tools.get_permit_details.invoke({"permit_number": "PLO-2020-001"})
+
+
+def test_confirmed_miss_is_negative_cached(container):
+    first = tools.get_permit_details.invoke({"permit_number": "PLO-0000-404"})
+    second = tools.get_permit_details.invoke({"permit_number": "PLO-0000-404"})
+
+    assert first == second == "Permit 'PLO-0000-404' not found in the database."
+    assert len(container.queries) == 1
+    assert len(tools._negative_cache) == 1
+
+
+def test_embed_keyword_calls_azure_deployment_with_api_version(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={
+            "object": "list",
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}],
+            "model": "emb",
+            "usage": {"prompt_tokens": 2, "total_tokens": 2},
+        })
+
+    monkeypatch.setattr(tools, "httpx", SimpleNamespace(
+        Client=lambda **kwargs: httpx.Client(transport=httpx.MockTransport(handler)),
+        Timeout=httpx.Timeout,
+        Limits=httpx.Limits,
+    ))
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://aoai.example.com")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+    monkeypatch.setenv("AZURE_OPENAI_EMBEDDING_NAME", "emb")
+    monkeypatch.setenv("AZURE_OPENAI_PREVIEW_API_VERSION", "2024-05-01-preview")
+    tools._openai.cache_clear()
+    try:
+        assert tools._embed_keyword("pipeline permit") == [0.1, 0.2]
+    finally:
+        tools._openai.cache_clear()
+
+    (request,) = requests
+    assert request.url.path == "/openai/deployments/emb/embeddings"
+    assert request.url.params["api-version"] == "2024-05-01-preview"
+    assert request.headers["api-key"] == "key"
+
+
+def test_tools_share_the_query_cache(container):
+    container.rows = [EXPIRED_PERMIT]
+    tools.get_list_documents_already_expired.invoke({})
+    tools._tool_cache.clear()
+    tools.get_list_documents_already_expired.invoke({})
+
+    assert len(container.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_request_per_normalized_keyword(monkeypatch):
+    searches = []
+
+    async def search(keyword, day):
+        searches.append(keyword)
+        await asyncio.sleep(0.01)
+        return f"content for {keyword}"
+
+    monkeypatch.setattr(tools, "_search_permit_documents", search)
+    tools.clear_permit_tool_cache()
+
+    results = await asyncio.gather(
+        tools.get_permit_document_content("submarine pipeline"),
+        tools.get_permit_document_content("  Submarine   PIPELINE "),
+        tools.get_permit_document_content("submarine pipeline"),
+    )
+
+    assert searches == ["submarine pipeline"]
+    assert set(results) == {"content for submarine pipeline"}
+    assert tools._inflight_searches == {}
+
+
+def test_tool_results_expire_after_ttl(container, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(tools, "_tool_cache", TTLCache(
+        maxsize=16, ttl=tools.TOOL_CACHE_TTL, timer=lambda: now[0]
+    ))
+    container.rows = [EXPIRED_PERMIT]
+
+    first = tools.get_list_documents_already_expired.invoke({})
+    assert tools.get_list_documents_already_expired.invoke({}) == first
+    assert len(tools._tool_cache) == 1
+
+    queries.invalidate_all()
+    assert tools.get_list_documents_already_expired.invoke({}) == first
+    assert len(container.queries) == 1
+
+    now[0] += tools.TOOL_CACHE_TTL
+    assert tools.get_list_documents_already_expired.invoke({}) == first
+    assert len(container.queries) == 2
+
+
+@pytest.mark.parametrize("keyword, junk", [
+    ("", True),
+    ("ab", True),
+    ("the", True),
+    ("apa itu yang", True),
+    ("what is the", True),
+    ("IT Semarang", False),
+    ("PLO", False),
+    ("submarine pipeline", False),
+])
+def test_junk_keyword_filter(keyword, junk):
+    assert tools._is_junk_keyword(keyword) is junk
+
+
+@pytest.mark.asyncio
+async def test_junk_keyword_skips_search(monkeypatch):
+    async def search(keyword, day):
+        raise AssertionError("junk keyword reached Azure AI Search")
+
+    monkeypatch.setattr(tools, "_search_permit_documents", search)
+
+    assert await tools.get_permit_document_content("  of  ") == tools._NO_DOCUMENTS
+
+
+class FakeSearch:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    async def semantic_ranking_search(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_low_scoring_hits_skip_the_content_fallback(monkeypatch):
+    search = FakeSearch({"value": [
+        {"title": "PLO", "@search.rerankerScore": 1.2, "@search.captions": [{"text": "caption"}]},
+    ]})
+    monkeypatch.setattr(tools, "_search", lambda: search)
+
+    result = await tools._search_permit_documents("submarine pipeline", "2026-01-01")
+
+    assert result == tools._NO_DOCUMENTS
+    assert len(search.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_relevant_hits_without_captions_fall_back_to_content(monkeypatch):
+    search = FakeSearch(
+        {"value": [{"title": "PLO", "@search.rerankerScore": 2.5}]},
+        {"value": [{"title": "PLO", "@search.rerankerScore": 2.5, "content": "full text"}]},
+    )
+    monkeypatch.setattr(tools, "_search", lambda: search)
+    tools.clear_permit_tool_cache()
+
+    result = await tools._search_permit_documents("submarine pipeline", "2026-01-01")
+
+    assert result == "[PLO]:\nfull text"
+    assert [call["k"] for call in search.calls] == [tools.CAPTION_SEARCH_K, tools.CONTENT_SEARCH_K]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_search(monkeypatch):
+    release = asyncio.Event()
+
+    async def search(keyword, day):
+        await release.wait()
+        return f"content for {keyword}"
+
+    monkeypatch.setattr(tools, "_search_permit_documents", search)
+    tools.clear_permit_tool_cache()
+
+    owner = asyncio.ensure_future(tools.get_permit_document_content("submarine pipeline"))
+    await asyncio.sleep(0)
+    joiner = asyncio.ensure_future(tools.get_permit_document_content("submarine pipeline"))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await joiner == "content for submarine pipeline"
+    assert owner.cancelled()
+    assert tools._inflight_searches == {}
@@ -0,0 +1,94 @@
+import pytest
+from backend.client.search_cache import SemanticCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  Submarine   PIPELINE ") == "submarine pipeline"
+
+
+def test_semantic_cache_exact_hit_and_namespace():
+    cache = SemanticCache()
+    cache.set(("idx", 10), "submarine pipeline", {"value": [1]})
+
+    assert cache.get(("idx", 10), "Submarine  Pipeline") == {"value": [1]}
+    assert cache.get(("idx", 5), "submarine pipeline") is None
+
+
+def test_semantic_cache_ttl_expiry():
+    cache = SemanticCache(ttl=0)
+    cache.set("ns", "query", {"value": []})
+
+    assert cache.get("ns", "query") is None
+    assert len(cache) == 0
+
+
+def test_semantic_cache_lru_eviction():
+    cache = SemanticCache(maxsize=2)
+    cache.set("ns", "a", 1)
+    cache.set("ns", "b", 2)
+    cache.get("ns", "a")
+    cache.set("ns", "c", 3)
+
+    assert cache.get("ns", "a") == 1
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "c") == 3
+
+
+def test_semantic_cache_similarity_hit():
+    vectors = {
+        "pipeline permit": [1.0, 0.0],
+        "permit for pipeline": [0.95, 0.05],
+        "expired permits": [0.0, 1.0],
+    }
+    cache = SemanticCache(threshold=0.9, embed=lambda text: vectors[text])
+    cache.set("ns", "pipeline permit", {"value": ["hit"]})
+
+    assert cache.get("ns", "permit for pipeline") == {"value": ["hit"]}
+    assert cache.get("ns", "expired permits") is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_async_embeds_once():
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return [1.0, 0.0]
+
+    cache = SemanticCache(embed=embed)
+    assert await cache.aget("ns", "pipeline permit") is None
+    await cache.aset("ns", "pipeline permit", {"value": []})
+
+    assert await cache.aget("ns", "Pipeline  Permit") == {"value": []}
+    assert calls == ["pipeline permit"]
+
+
+def test_semantic_cache_embedding_failure_backs_off():
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        raise RuntimeError("api-version is required")
+
+    cache = SemanticCache(embed=embed, embed_retry_after=60)
+    cache.set("ns", "pipeline permit", {"value": []})
+
+    assert cache.get("ns", "permit for pipeline") is None
+    assert cache.get("ns", "Pipeline  Permit") == {"value": []}
+    assert calls == ["pipeline permit"]
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_scan_is_capped_to_recent_entries():
+    vectors = {
+        "pipeline permit": [1.0, 0.0],
+        "permit for pipeline": [0.95, 0.05],
+        "expired permits": [0.0, 1.0],
+        "expiring permits": [0.0, 1.0],
+    }
+    cache = SemanticCache(threshold=0.9, embed=lambda text: vectors[text], max_scan=1)
+    cache.set("ns", "pipeline permit", {"value": ["old"]})
+    cache.set("ns", "expired permits", {"value": ["recent"]})
+
+    assert await cache.aget("ns", "permit for pipeline") is None
+    assert await cache.aget("ns", "expiring permits") == {"value": ["recent"]}